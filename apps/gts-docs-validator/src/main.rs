@@ -28,13 +28,15 @@
 mod scanner;
 mod validator;
 
-use std::path::PathBuf;
+use std::io::{self, BufWriter, Write};
+use std::path::{Path, PathBuf};
 use std::process::ExitCode;
 
 use clap::Parser;
 use colored::Colorize;
+use serde::{Serialize, Serializer};
 
-use crate::scanner::{find_files, scan_file};
+use crate::scanner::{find_files, scan_files};
 use crate::validator::ValidationResult;
 
 /// GTS Documentation Validator (DE0903)
@@ -123,21 +125,17 @@ fn main() -> ExitCode {
 
     // Scan all files and collect errors
     let mut result = ValidationResult::new(files.len());
-
-    for file_path in &files {
-        if cli.verbose {
-            eprintln!("  Scanning: {}", file_path.display());
-        }
-
-        let file_errors = scan_file(file_path, cli.vendor.as_deref(), cli.verbose);
-        result.add_errors(file_errors);
-    }
+    result.add_errors(scan_files(&files, cli.vendor.as_deref(), cli.verbose));
 
     // Output results
-    if cli.json {
-        print_json_results(&result);
+    let printed = if cli.json {
+        print_json_results(&result)
     } else {
-        print_results(&result, cli.verbose);
+        print_results(&result, cli.verbose)
+    };
+    if let Err(e) = printed {
+        eprintln!("Error: Failed to write results: {e}");
+        return ExitCode::FAILURE;
     }
 
     if result.is_ok() {
@@ -147,104 +145,134 @@ fn main() -> ExitCode {
     }
 }
 
-fn print_json_results(result: &ValidationResult) {
-    let output = serde_json::json!({
-        "files_scanned": result.files_scanned,
-        "errors_count": result.errors.len(),
-        "ok": result.is_ok(),
-        "errors": result.errors.iter().map(|e| {
-            serde_json::json!({
-                "file": e.file.display().to_string(),
-                "line": e.line,
-                "column": e.column,
-                "gts_id": e.gts_id,
-                "error": e.error,
-            })
-        }).collect::<Vec<_>>(),
-    });
+/// JSON report, serialized straight to stdout without an intermediate `serde_json::Value`
+#[derive(Serialize)]
+struct JsonReport<'a> {
+    files_scanned: usize,
+    errors_count: usize,
+    ok: bool,
+    errors: Vec<JsonError<'a>>,
+}
 
-    println!(
-        "{}",
-        serde_json::to_string_pretty(&output).expect("Failed to serialize JSON")
-    );
+/// Single error entry of the JSON report (context is omitted)
+#[derive(Serialize)]
+struct JsonError<'a> {
+    #[serde(serialize_with = "serialize_display")]
+    file: &'a Path,
+    line: usize,
+    column: usize,
+    gts_id: &'a str,
+    error: &'a str,
 }
 
-fn print_results(result: &ValidationResult, verbose: bool) {
-    println!();
-    println!("{}", "=".repeat(80));
-    println!("  {}", "GTS DOCUMENTATION VALIDATOR (DE0903)".bold());
-    println!("{}", "=".repeat(80));
-    println!();
-    println!("  Files scanned: {}", result.files_scanned);
-    println!("  Errors found:  {}", result.errors.len());
-    println!();
+fn serialize_display<S: Serializer>(path: &&Path, serializer: S) -> Result<S::Ok, S::Error> {
+    serializer.collect_str(&path.display())
+}
 
-    if !result.errors.is_empty() {
-        println!("{}", "-".repeat(80));
-        println!("  {}", "ERRORS".red().bold());
-        println!("{}", "-".repeat(80));
-
-        // Group errors by file
-        let mut errors_by_file: std::collections::HashMap<&PathBuf, Vec<_>> =
-            std::collections::HashMap::new();
-        for err in &result.errors {
-            errors_by_file.entry(&err.file).or_default().push(err);
-        }
+fn print_json_results(result: &ValidationResult) -> io::Result<()> {
+    let report = JsonReport {
+        files_scanned: result.files_scanned,
+        errors_count: result.errors.len(),
+        ok: result.is_ok(),
+        errors: result
+            .errors
+            .iter()
+            .map(|e| JsonError {
+                file: &e.file,
+                line: e.line,
+                column: e.column,
+                gts_id: &e.gts_id,
+                error: &e.error,
+            })
+            .collect(),
+    };
 
-        let mut sorted_files: Vec<_> = errors_by_file.keys().collect();
-        sorted_files.sort();
+    let mut out = BufWriter::new(io::stdout().lock());
+    serde_json::to_writer_pretty(&mut out, &report)?;
+    writeln!(out)?;
+    out.flush()
+}
 
-        for file_path in sorted_files {
-            let file_errors = &errors_by_file[file_path];
-            println!("\n  {}:", file_path.display().to_string().yellow());
+fn print_results(result: &ValidationResult, verbose: bool) -> io::Result<()> {
+    let mut out = BufWriter::new(io::stdout().lock());
 
-            let mut sorted_errors: Vec<_> = file_errors.iter().collect();
-            sorted_errors.sort_by_key(|e| e.line);
+    writeln!(out)?;
+    writeln!(out, "{}", "=".repeat(80))?;
+    writeln!(out, "  {}", "GTS DOCUMENTATION VALIDATOR (DE0903)".bold())?;
+    writeln!(out, "{}", "=".repeat(80))?;
+    writeln!(out)?;
+    writeln!(out, "  Files scanned: {}", result.files_scanned)?;
+    writeln!(out, "  Errors found:  {}", result.errors.len())?;
+    writeln!(out)?;
 
-            for err in sorted_errors {
-                println!(
+    if !result.errors.is_empty() {
+        writeln!(out, "{}", "-".repeat(80))?;
+        writeln!(out, "  {}", "ERRORS".red().bold())?;
+        writeln!(out, "{}", "-".repeat(80))?;
+
+        // Errors arrive grouped by file, in sorted file order and by line within
+        // each file (see `scan_files`), so consecutive runs are the file sections
+        for file_errors in result.errors.chunk_by(|a, b| a.file == b.file) {
+            writeln!(
+                out,
+                "\n  {}:",
+                file_errors[0].file.display().to_string().yellow()
+            )?;
+
+            for err in file_errors {
+                writeln!(
+                    out,
                     "    Line {}:{} - {}",
                     err.line,
                     err.column,
                     err.gts_id.cyan()
-                );
-                println!("      Error: {}", err.error.red());
+                )?;
+                writeln!(out, "      Error: {}", err.error.red())?;
                 if verbose && !err.context.is_empty() {
-                    println!("      Context: {}", err.context.dimmed());
+                    writeln!(out, "      Context: {}", err.context.dimmed())?;
                 }
             }
         }
-        println!();
+        writeln!(out)?;
     }
 
-    println!("{}", "=".repeat(80));
+    writeln!(out, "{}", "=".repeat(80))?;
     if result.is_ok() {
-        println!(
+        writeln!(
+            out,
             "  STATUS: {} {}",
             "ALL GTS IDENTIFIERS VALID".green().bold(),
             "\u{2713}".green()
-        );
+        )?;
     } else {
-        println!(
+        writeln!(
+            out,
             "  STATUS: {} {}",
             format!("{} INVALID GTS IDENTIFIERS FOUND", result.errors.len())
                 .red()
                 .bold(),
             "\u{2717}".red()
-        );
-        println!();
-        println!("  To fix:");
-        println!("    - Schema IDs must end with ~ (e.g., gts.x.core.type.v1~)");
-        println!("    - Each segment needs 5 parts: vendor.org.package.type.version");
-        println!("    - No hyphens allowed, use underscores");
-        println!("    - Wildcards (*) only in filter/pattern contexts");
+        )?;
+        writeln!(out)?;
+        writeln!(out, "  To fix:")?;
+        writeln!(
+            out,
+            "    - Schema IDs must end with ~ (e.g., gts.x.core.type.v1~)"
+        )?;
+        writeln!(
+            out,
+            "    - Each segment needs 5 parts: vendor.org.package.type.version"
+        )?;
+        writeln!(out, "    - No hyphens allowed, use underscores")?;
+        writeln!(out, "    - Wildcards (*) only in filter/pattern contexts")?;
         if result
             .errors
             .iter()
             .any(|e| e.error.contains("Vendor mismatch"))
         {
-            println!("    - Ensure all GTS IDs use the expected vendor");
+            writeln!(out, "    - Ensure all GTS IDs use the expected vendor")?;
         }
     }
-    println!("{}", "=".repeat(80));
+    writeln!(out, "{}", "=".repeat(80))?;
+    out.flush()
 }
@@ -1,16 +1,24 @@
 //! File scanning functionality for GTS documentation validation
 
+use std::collections::HashMap;
+use std::ffi::OsStr;
 use std::fs;
+use std::num::NonZeroUsize;
 use std::path::{Path, PathBuf};
+use std::sync::LazyLock;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::thread;
 
 use glob::Pattern;
 use regex::Regex;
 use walkdir::WalkDir;
 
-use crate::validator::{GtsError, is_bad_example_context, is_wildcard_context, validate_gts_id};
+use crate::validator::{
+    BAD_EXAMPLE_LOOKBACK, GtsError, is_bad_example_context, is_wildcard_context, validate_gts_id,
+};
 
-/// File patterns to scan
-const FILE_PATTERNS: &[&str] = &["*.md", "*.json", "*.yaml", "*.yml"];
+/// File extensions to scan (matched case-insensitively)
+const FILE_EXTENSIONS: &[&str] = &["md", "json", "yaml", "yml"];
 
 /// Directories to skip
 const SKIP_DIRS: &[&str] = &["target", "node_modules", ".git", "vendor", ".gts-spec"];
@@ -18,18 +26,16 @@ const SKIP_DIRS: &[&str] = &["target", "node_modules", ".git", "vendor", ".gts-s
 /// Files to skip (relative paths)
 const SKIP_FILES: &[&str] = &["docs/api/api.json"];
 
-/// Patterns that look like GTS but aren't (false positives)
-const FALSE_POSITIVE_PATTERNS: &[&str] = &[
-    r"^gts\.rs$",     // Rust file named gts.rs
-    r"^gts\.[a-z]+$", // Single component like gts.rs, gts.py
-];
+/// Literal prefix every GTS-looking string starts with
+const GTS_PREFIX: &str = "gts.";
 
 /// Pattern to find GTS-looking strings
 /// Must have at least 2 dots after gts. to catch potential GTS IDs
+/// (this also keeps out look-alikes such as `gts.rs` or `gts.py`)
 /// Include hyphen so we can catch and report invalid hyphens
-fn gts_pattern() -> Regex {
+static GTS_PATTERN: LazyLock<Regex> = LazyLock::new(|| {
     Regex::new(r"gts\.[a-z0-9_.*~-]+\.[a-z0-9_.*~-]+").expect("Invalid regex pattern")
-}
+});
 
 /// Check if a path matches any of the exclude patterns
 fn matches_exclude(path: &Path, exclude_patterns: &[Pattern]) -> bool {
@@ -52,27 +58,23 @@ fn matches_exclude(path: &Path, exclude_patterns: &[Pattern]) -> bool {
     false
 }
 
+/// Check if a single path component is one of the skip directories
+fn is_skip_dir_name(name: &OsStr) -> bool {
+    name.to_str().is_some_and(|name| SKIP_DIRS.contains(&name))
+}
+
 /// Check if path contains any skip directories
 fn in_skip_dir(path: &Path) -> bool {
-    for component in path.components() {
-        if let std::path::Component::Normal(name) = component
-            && SKIP_DIRS.iter().any(|skip| name.to_string_lossy() == *skip)
-        {
-            return true;
-        }
-    }
-    false
+    path.components().any(|component| {
+        matches!(component, std::path::Component::Normal(name) if is_skip_dir_name(name))
+    })
 }
 
-/// Check if file matches any of the file patterns
+/// Check if file has one of the scanned extensions
 fn matches_file_pattern(path: &Path) -> bool {
-    if let Some(ext) = path.extension() {
-        let ext_str = ext.to_string_lossy().to_lowercase();
-        let with_dot = format!("*.{ext_str}");
-        FILE_PATTERNS.iter().any(|p| *p == with_dot)
-    } else {
-        false
-    }
+    path.extension()
+        .and_then(OsStr::to_str)
+        .is_some_and(|ext| FILE_EXTENSIONS.iter().any(|e| ext.eq_ignore_ascii_case(e)))
 }
 
 /// Find all files to scan in the given paths
@@ -100,25 +102,27 @@ pub fn find_files(paths: &[PathBuf], exclude: &[String], verbose: bool) -> Vec<P
                 files.push(path.clone());
             }
         } else if path.is_dir() {
+            // Skip directories in skip list: the root is checked once, and any
+            // skipped directory below it is pruned without being descended into
+            if in_skip_dir(path) {
+                continue;
+            }
+
             for entry in WalkDir::new(path)
                 .follow_links(true)
                 .into_iter()
+                .filter_entry(|entry| !is_skip_dir_name(entry.file_name()))
                 .filter_map(Result::ok)
             {
                 let file_path = entry.path();
 
-                // Skip directories in skip list
-                if in_skip_dir(file_path) {
-                    continue;
-                }
-
-                // Only process files
-                if !file_path.is_file() {
+                // Check file pattern first: it needs no filesystem access
+                if !matches_file_pattern(file_path) {
                     continue;
                 }
 
-                // Check file pattern
-                if !matches_file_pattern(file_path) {
+                // Only process files (the walker already knows the type)
+                if !entry.file_type().is_file() {
                     continue;
                 }
 
@@ -149,23 +153,9 @@ pub fn find_files(paths: &[PathBuf], exclude: &[String], verbose: bool) -> Vec<P
     files
 }
 
-/// Check if a matched string is a false positive
-fn is_false_positive(gts_id: &str) -> bool {
-    for pattern in FALSE_POSITIVE_PATTERNS {
-        if let Ok(re) = Regex::new(pattern)
-            && re.is_match(gts_id)
-        {
-            return true;
-        }
-    }
-    false
-}
-
 /// Scan a single file for GTS identifiers and validate them
 #[must_use]
 pub fn scan_file(path: &Path, expected_vendor: Option<&str>, verbose: bool) -> Vec<GtsError> {
-    let mut errors = Vec::new();
-
     let content = match fs::read_to_string(path) {
         Ok(c) => c,
         Err(e) => {
@@ -183,70 +173,193 @@ pub fn scan_file(path: &Path, expected_vendor: Option<&str>, verbose: bool) -> V
         }
     };
 
-    let lines: Vec<&str> = content.lines().collect();
-    let gts_re = gts_pattern();
+    // Context is only displayed in verbose mode
+    scan_text(&content, path, expected_vendor, verbose)
+}
 
-    for (line_idx, line) in lines.iter().enumerate() {
-        let line_num = line_idx + 1;
+/// Scan files on all available cores
+///
+/// Workers pull the next file from a shared counter, so a few large files do not
+/// stall the rest. Errors are returned in the same order as `files`.
+#[must_use]
+pub fn scan_files(
+    files: &[PathBuf],
+    expected_vendor: Option<&str>,
+    verbose: bool,
+) -> Vec<GtsError> {
+    let workers = thread::available_parallelism()
+        .map_or(1, NonZeroUsize::get)
+        .min(files.len());
+    let next = AtomicUsize::new(0);
+
+    let mut per_file: Vec<(usize, Vec<GtsError>)> = thread::scope(|scope| {
+        let handles: Vec<_> = (0..workers)
+            .map(|_| {
+                scope.spawn(|| {
+                    let mut scanned = Vec::new();
+                    loop {
+                        let idx = next.fetch_add(1, Ordering::Relaxed);
+                        let Some(file_path) = files.get(idx) else {
+                            break;
+                        };
+                        if verbose {
+                            eprintln!("  Scanning: {}", file_path.display());
+                        }
+                        scanned.push((idx, scan_file(file_path, expected_vendor, verbose)));
+                    }
+                    scanned
+                })
+            })
+            .collect();
+        handles
+            .into_iter()
+            .flat_map(|h| h.join().unwrap_or_else(|e| std::panic::resume_unwind(e)))
+            .collect()
+    });
+
+    per_file.sort_unstable_by_key(|(idx, _)| *idx);
+    per_file
+        .into_iter()
+        .flat_map(|(_, errors)| errors)
+        .collect()
+}
 
-        for mat in gts_re.find_iter(line) {
-            let gts_id = mat.as_str();
-            let col = mat.start() + 1;
+/// Extract up to 20 bytes of surrounding text on each side of a match,
+/// widened to valid UTF-8 boundaries and marked with "..." where truncated
+fn match_context(line: &str, match_start: usize, match_end: usize) -> String {
+    let ctx_start = match_start.saturating_sub(20);
+    let ctx_end = (match_end + 20).min(line.len());
+
+    // safe_start: nearest boundary at or before ctx_start
+    let safe_start = line
+        .char_indices()
+        .map(|(i, _)| i)
+        .take_while(|&i| i <= ctx_start)
+        .last()
+        .unwrap_or(0);
+    // safe_end: nearest boundary at or after ctx_end
+    let safe_end = line
+        .char_indices()
+        .map(|(i, c)| i + c.len_utf8())
+        .find(|&i| i >= ctx_end)
+        .unwrap_or(line.len());
+
+    let mut ctx_text = String::with_capacity(safe_end - safe_start + 6);
+    if safe_start > 0 {
+        ctx_text.push_str("...");
+    }
+    ctx_text.push_str(&line[safe_start..safe_end]);
+    if safe_end < line.len() {
+        ctx_text.push_str("...");
+    }
+    ctx_text
+}
 
-            // Skip false positives
-            if is_false_positive(gts_id) {
-                continue;
-            }
+/// Text of line `idx` without its line terminator, matching `str::lines`
+fn line_at<'a>(content: &'a str, line_starts: &[usize], idx: usize) -> &'a str {
+    let start = line_starts[idx];
+    match line_starts.get(idx + 1) {
+        Some(&next) => {
+            let line = &content[start..next - 1];
+            line.strip_suffix('\r').unwrap_or(line)
+        }
+        None => &content[start..],
+    }
+}
 
-            // Skip if in bad example context
-            let prev_lines: Vec<&str> = lines[..line_idx].to_vec();
-            if is_bad_example_context(line, &prev_lines) {
-                continue;
-            }
+/// Check whether line `idx` is in a "bad example" context, given its preceding lines
+fn is_bad_example_line(content: &str, line_starts: &[usize], idx: usize) -> bool {
+    let mut prev_lines = [""; BAD_EXAMPLE_LOOKBACK];
+    let first_prev = idx.saturating_sub(BAD_EXAMPLE_LOOKBACK);
+    for (slot, prev_idx) in prev_lines.iter_mut().zip(first_prev..idx) {
+        *slot = line_at(content, line_starts, prev_idx);
+    }
+    is_bad_example_context(
+        line_at(content, line_starts, idx),
+        &prev_lines[..idx - first_prev],
+    )
+}
 
-            // Check if wildcards are allowed
-            let allow_wildcards = is_wildcard_context(line, mat.start());
-
-            // Validate the identifier
-            let validation_errors = validate_gts_id(gts_id, expected_vendor, allow_wildcards);
-
-            for err in validation_errors {
-                // Extract surrounding text for context (safely handle UTF-8 boundaries)
-                let ctx_start = mat.start().saturating_sub(20);
-                let ctx_end = (mat.end() + 20).min(line.len());
-
-                // Find valid UTF-8 boundaries
-                // safe_start: nearest boundary at or before ctx_start
-                let safe_start = line
-                    .char_indices()
-                    .map(|(i, _)| i)
-                    .take_while(|&i| i <= ctx_start)
-                    .last()
-                    .unwrap_or(0);
-                // safe_end: nearest boundary at or after ctx_end
-                let safe_end = line
-                    .char_indices()
-                    .map(|(i, c)| i + c.len_utf8())
-                    .find(|&i| i >= ctx_end)
-                    .unwrap_or(line.len());
-
-                let mut ctx_text = line[safe_start..safe_end].to_owned();
-                if safe_start > 0 {
-                    ctx_text = format!("...{ctx_text}");
-                }
-                if safe_end < line.len() {
-                    ctx_text = format!("{ctx_text}...");
-                }
+/// Scan already-loaded file content for GTS identifiers and validate them
+///
+/// `path` is only used to label the reported errors. The surrounding-text
+/// `context` of each error is only built when `with_context` is set.
+#[must_use]
+pub fn scan_text(
+    content: &str,
+    path: &Path,
+    expected_vendor: Option<&str>,
+    with_context: bool,
+) -> Vec<GtsError> {
+    let mut errors = Vec::new();
+
+    // Fast path: a single memchr-backed search rules out most files
+    // before any per-line work
+    if !content.contains(GTS_PREFIX) {
+        return errors;
+    }
+
+    // Byte offset where each line starts; matches are found in the whole
+    // buffer at once and mapped back to their line by binary search.
+    // The pattern never matches a line break, so a match stays on one line.
+    let line_starts: Vec<usize> = std::iter::once(0)
+        .chain(content.match_indices('\n').map(|(i, _)| i + 1))
+        .collect();
+    // Docs repeat the same IDs many times; validate each distinct one once
+    let mut validated: HashMap<(&str, bool), Vec<String>> = HashMap::new();
+    // Bad example verdict for the most recent line that had a match
+    let mut bad_example_line: Option<(usize, bool)> = None;
+
+    for mat in GTS_PATTERN.find_iter(content) {
+        let gts_id = mat.as_str();
 
-                errors.push(GtsError {
-                    file: path.to_path_buf(),
-                    line: line_num,
-                    column: col,
-                    gts_id: gts_id.to_owned(),
-                    error: err,
-                    context: ctx_text,
-                });
+        let line_idx = line_starts.partition_point(|&start| start <= mat.start()) - 1;
+        let line_num = line_idx + 1;
+        let line = line_at(content, &line_starts, line_idx);
+        let match_start = mat.start() - line_starts[line_idx];
+        let match_end = mat.end() - line_starts[line_idx];
+        let col = match_start + 1;
+
+        // Skip if in bad example context (evaluated once per line)
+        let bad_example = match bad_example_line {
+            Some((idx, bad)) if idx == line_idx => bad,
+            _ => {
+                let bad = is_bad_example_line(content, &line_starts, line_idx);
+                bad_example_line = Some((line_idx, bad));
+                bad
             }
+        };
+        if bad_example {
+            continue;
+        }
+
+        // Check if wildcards are allowed
+        let allow_wildcards = is_wildcard_context(line, match_start);
+
+        // Validate the identifier
+        let validation_errors = validated
+            .entry((gts_id, allow_wildcards))
+            .or_insert_with(|| validate_gts_id(gts_id, expected_vendor, allow_wildcards));
+
+        if validation_errors.is_empty() {
+            continue;
+        }
+
+        // One context per match, shared by all of its errors
+        let ctx_text = if with_context {
+            match_context(line, match_start, match_end)
+        } else {
+            String::new()
+        };
+        for err in validation_errors {
+            errors.push(GtsError {
+                file: path.to_path_buf(),
+                line: line_num,
+                column: col,
+                gts_id: gts_id.to_owned(),
+                error: err.clone(),
+                context: ctx_text.clone(),
+            });
         }
     }
 
@@ -257,8 +370,15 @@ pub fn scan_file(path: &Path, expected_vendor: Option<&str>, verbose: bool) -> V
 #[allow(clippy::non_ascii_literal)] // Allow non-ASCII literals - we're testing UTF-8 handling
 mod tests {
     use super::*;
-    use std::io::Write;
-    use tempfile::NamedTempFile;
+
+    use std::time::{Duration, Instant};
+
+    /// Upper bound for the median `scan_text` run over the ~1 MB perf fixture
+    const SCAN_THROUGHPUT_BUDGET: Duration = Duration::from_millis(500);
+
+    fn scan(content: &str, expected_vendor: Option<&str>) -> Vec<GtsError> {
+        scan_text(content, Path::new("test.md"), expected_vendor, true)
+    }
 
     #[test]
     fn test_matches_file_pattern() {
@@ -267,6 +387,9 @@ mod tests {
         assert!(matches_file_pattern(Path::new("schema.yaml")));
         assert!(!matches_file_pattern(Path::new("main.rs")));
         assert!(!matches_file_pattern(Path::new("script.py")));
+        assert!(matches_file_pattern(Path::new("CHANGELOG.MD")));
+        assert!(!matches_file_pattern(Path::new("logo.png")));
+        assert!(!matches_file_pattern(Path::new("Makefile")));
     }
 
     #[test]
@@ -276,66 +399,157 @@ mod tests {
         assert!(!in_skip_dir(Path::new("docs/README.md")));
     }
 
+    #[test]
+    fn test_scan_file_from_disk() {
+        // One temp directory for all fixtures; removed when `dir` is dropped
+        let dir = tempfile::tempdir().unwrap();
+        let fixtures = [
+            ("valid.md", "The type is `gts.x.core.modkit.plugin.v1~`"),
+            ("invalid.md", "The type is: `gts.x.core.plugin.v1~`"),
+            ("ignored.rs", "The type is: `gts.x.core.plugin.v1~`"),
+            (
+                "node_modules/pkg/README.md",
+                "The type is: `gts.x.core.plugin.v1~`",
+            ),
+        ];
+        for (name, content) in fixtures {
+            let path = dir.path().join(name);
+            fs::create_dir_all(path.parent().unwrap()).unwrap();
+            fs::write(path, content).unwrap();
+        }
+
+        let files = find_files(&[dir.path().to_path_buf()], &[], false);
+        assert_eq!(
+            files,
+            vec![dir.path().join("invalid.md"), dir.path().join("valid.md")]
+        );
+
+        assert!(scan_file(&dir.path().join("valid.md"), None, false).is_empty());
+
+        let errors = scan_file(&dir.path().join("invalid.md"), None, false);
+        assert_eq!(errors.len(), 1);
+        assert_eq!(errors[0].file, dir.path().join("invalid.md"));
+        assert_eq!(errors[0].line, 1);
+
+        let errors = scan_file(&dir.path().join("missing.md"), None, false);
+        assert_eq!(errors.len(), 1);
+        assert!(errors[0].error.contains("Failed to read file"));
+    }
+
     #[test]
     fn test_scan_file_valid() {
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(
-            file,
-            "# Documentation\n\nThe type is `gts.x.core.modkit.plugin.v1~`"
-        )
-        .unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan(
+            "# Documentation\n\nThe type is `gts.x.core.modkit.plugin.v1~`",
+            None,
+        );
         assert!(errors.is_empty(), "Unexpected errors: {errors:?}");
     }
 
     #[test]
     fn test_scan_file_invalid_segment() {
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(
-            file,
-            "# Documentation\n\nThe type is: `gts.x.core.plugin.v1~`"
-        )
-        .unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan(
+            "# Documentation\n\nThe type is: `gts.x.core.plugin.v1~`",
+            None,
+        );
         assert_eq!(errors.len(), 1);
         assert!(errors[0].error.contains("5 components"));
     }
 
     #[test]
     fn test_scan_file_vendor_mismatch() {
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(
-            file,
-            "# Documentation\n\nThe type is: `gts.hx.core.modkit.plugin.v1~`"
-        )
-        .unwrap();
-
-        let errors = scan_file(file.path(), Some("x"), false);
+        let errors = scan(
+            "# Documentation\n\nThe type is: `gts.hx.core.modkit.plugin.v1~`",
+            Some("x"),
+        );
         assert!(!errors.is_empty());
         assert!(errors.iter().any(|e| e.error.contains("Vendor mismatch")));
     }
 
     #[test]
     fn test_scan_file_bad_example_skipped() {
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(
-            file,
-            "# Documentation\n\n## Example: Bad\n\nInvalid format: `gts.x.core.v1~`"
-        )
-        .unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan(
+            "# Documentation\n\n## Example: Bad\n\nInvalid format: `gts.x.core.v1~`",
+            None,
+        );
         assert!(errors.is_empty(), "Bad example should be skipped");
     }
 
     #[test]
-    fn test_scan_file_wildcard_in_filter() {
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(file, "Use `$filter=type_id eq 'gts.x.*'` to filter.").unwrap();
+    fn test_scan_file_repeated_ids() {
+        let errors = scan(
+            "`gts.x.core.plugin.v1~`\nvalid `gts.x.core.modkit.plugin.v1~`\n`gts.x.core.plugin.v1~`",
+            None,
+        );
+        let lines: Vec<usize> = errors.iter().map(|e| e.line).collect();
+        assert_eq!(lines, vec![1, 3], "Each occurrence should be reported");
+    }
+
+    #[test]
+    fn test_scan_file_line_mapping() {
+        let lf = "intro\n\n`gts.x.core.v1~` and `gts.y.core.v1~`\n\nlast `gts.x.core.pkg.v1~`";
+        let errors = scan(lf, None);
+        let positions: Vec<(usize, usize, &str)> = errors
+            .iter()
+            .map(|e| (e.line, e.column, e.context.as_str()))
+            .collect();
+        assert_eq!(
+            positions,
+            vec![
+                (3, 2, "`gts.x.core.v1~` and `gts.y.core.v1..."),
+                (3, 23, "...ts.x.core.v1~` and `gts.y.core.v1~`"),
+                (5, 7, "last `gts.x.core.pkg.v1~`"),
+            ]
+        );
+
+        // CRLF line endings map to the same lines, columns and contexts
+        let crlf: Vec<(usize, usize, String)> = scan(&lf.replace('\n', "\r\n"), None)
+            .into_iter()
+            .map(|e| (e.line, e.column, e.context))
+            .collect();
+        let lf: Vec<(usize, usize, String)> = errors
+            .into_iter()
+            .map(|e| (e.line, e.column, e.context))
+            .collect();
+        assert_eq!(crlf, lf);
+    }
+
+    #[test]
+    fn test_scan_text_without_context() {
+        let errors = scan_text(
+            "The type is: `gts.x.core.plugin.v1~`",
+            Path::new("test.md"),
+            None,
+            false,
+        );
+        assert_eq!(errors.len(), 1);
+        assert!(errors[0].context.is_empty());
+    }
 
-        let errors = scan_file(file.path(), None, false);
+    #[test]
+    fn test_file_names_are_not_gts_ids() {
+        assert!(scan("See gts.rs and gts.py, or `gts.md`.", None).is_empty());
+    }
+
+    #[test]
+    fn test_scan_file_no_gts_prefix() {
+        let content = "lorem ipsum gts ".repeat(100_000);
+        assert!(scan(&content, None).is_empty());
+    }
+
+    #[test]
+    fn test_scan_file_bad_example_lookback() {
+        // The marker is within the last 3 lines for the first ID only
+        let errors = scan(
+            "## Bad\n\n\n`gts.x.core.v1~`\n`gts.x.core.v1~`\n`gts.x.core.v1~`",
+            None,
+        );
+        let lines: Vec<usize> = errors.iter().map(|e| e.line).collect();
+        assert_eq!(lines, vec![5, 6]);
+    }
+
+    #[test]
+    fn test_scan_file_wildcard_in_filter() {
+        let errors = scan("Use `$filter=type_id eq 'gts.x.*'` to filter.", None);
         assert!(
             errors.is_empty(),
             "Wildcards in filter context should be allowed"
@@ -346,10 +560,7 @@ mod tests {
     fn test_utf8_boundary_alignment_emoji() {
         // Test with emoji (4-byte UTF-8) before GTS ID
         // Using hyphen in segment makes it genuinely malformed
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(file, "🚀 The type is `gts.x-vendor.org.pkg.type.v1~` here").unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan("🚀 The type is `gts.x-vendor.org.pkg.type.v1~` here", None);
         assert!(
             !errors.is_empty(),
             "Should detect malformed GTS ID with hyphen"
@@ -364,14 +575,10 @@ mod tests {
     fn test_utf8_boundary_alignment_multibyte_chars() {
         // Test with various multibyte characters (Chinese, Arabic, etc.)
         // Missing tilde at end makes it malformed
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(
-            file,
-            "中文测试 العربية `gts.x.core.modkit.plugin.v1` тест ελληνικά"
-        )
-        .unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan(
+            "中文测试 العربية `gts.x.core.modkit.plugin.v1` тест ελληνικά",
+            None,
+        );
         assert!(!errors.is_empty(), "Should detect GTS ID missing tilde");
         // Context extraction should not panic with multibyte chars
         assert!(!errors[0].context.is_empty());
@@ -384,10 +591,7 @@ mod tests {
     fn test_utf8_boundary_alignment_at_start() {
         // Test GTS ID at the very start with multibyte chars after
         // Too few segments (only 4 instead of 5)
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(file, "`gts.x.core.type.v1~` 日本語テスト").unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan("`gts.x.core.type.v1~` 日本語テスト", None);
         assert!(!errors.is_empty(), "Should detect too few segments");
         // safe_start should be 0, safe_end should align properly
         let _ = errors[0].context.chars().count();
@@ -397,10 +601,7 @@ mod tests {
     fn test_utf8_boundary_alignment_at_end() {
         // Test GTS ID near end of line with multibyte chars before
         // Hyphen makes it malformed
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(file, "한글 테스트 🎉 `gts.my-vendor.org.pkg.type.v1~`").unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan("한글 테스트 🎉 `gts.my-vendor.org.pkg.type.v1~`", None);
         assert!(!errors.is_empty(), "Should detect hyphen in GTS ID");
         // safe_end should align to line.len() properly
         let _ = errors[0].context.chars().count();
@@ -410,14 +611,10 @@ mod tests {
     fn test_utf8_boundary_alignment_mixed_widths() {
         // Test with mix of 1-byte, 2-byte, 3-byte, and 4-byte UTF-8 chars
         // Missing version prefix 'v' makes it malformed
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
-        writeln!(
-            file,
-            "ASCII ñ 中 🎨 `gts.x.core.modkit.plugin.1~` 🚀 文 ü text"
-        )
-        .unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan(
+            "ASCII ñ 中 🎨 `gts.x.core.modkit.plugin.1~` 🚀 文 ü text",
+            None,
+        );
         assert!(!errors.is_empty(), "Should detect missing 'v' in version");
         let context = &errors[0].context;
 
@@ -433,13 +630,10 @@ mod tests {
     #[test]
     fn test_utf8_context_window_stability() {
         // Verify that context windows are stable regardless of char position
-        let mut file = NamedTempFile::with_suffix(".md").unwrap();
         // Create a line where the 20-char offset lands in middle of multibyte char
         let prefix = "🎨🎨🎨🎨🎨"; // 5 emoji = 20 bytes
         // Too few segments (only 4) makes it malformed
-        writeln!(file, "{prefix}`gts.x.core.pkg.v1~` suffix").unwrap();
-
-        let errors = scan_file(file.path(), None, false);
+        let errors = scan(&format!("{prefix}`gts.x.core.pkg.v1~` suffix"), None);
         assert!(!errors.is_empty(), "Should detect too few segments");
 
         // Context should start at a valid boundary (at or before offset 20)
@@ -451,4 +645,37 @@ mod tests {
         // Should contain the GTS ID
         assert!(context.contains("gts.x.core.pkg.v1~"));
     }
+
+    #[test]
+    #[ignore = "perf test: run with --ignored"]
+    fn test_scan_throughput() {
+        // Deterministic ~1 MB fixture: 100 valid and 10 invalid IDs interleaved with noise
+        let noise = "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n".repeat(180);
+        let mut content = String::new();
+        for i in 0..110 {
+            content.push_str(&noise);
+            if i % 11 == 10 {
+                content.push_str("Broken `gts.x.core.plugin.v1~` id\n");
+            } else {
+                content.push_str("Type `gts.x.core.modkit.plugin.v1~` id\n");
+            }
+        }
+        assert!(content.len() > 1_000_000);
+
+        let mut timings: Vec<Duration> = (0..20)
+            .map(|_| {
+                let start = Instant::now();
+                let errors = scan(&content, None);
+                let elapsed = start.elapsed();
+                assert_eq!(errors.len(), 10);
+                elapsed
+            })
+            .collect();
+        timings.sort();
+        let median = timings[timings.len().div_euclid(2)];
+        assert!(
+            median < SCAN_THROUGHPUT_BUDGET,
+            "Median scan took {median:?}, budget is {SCAN_THROUGHPUT_BUDGET:?}"
+        );
+    }
 }
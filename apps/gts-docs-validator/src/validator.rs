@@ -1,8 +1,10 @@
 //! GTS ID validation logic
 
 use std::path::PathBuf;
+use std::sync::LazyLock;
 
 use gts::GtsID;
+use regex::Regex;
 use serde::Serialize;
 
 /// Represents a single GTS validation error
@@ -81,6 +83,26 @@ const SKIP_VALIDATION_CONTEXTS: &[&str] = &[
     "**given**",
 ];
 
+/// Build a case-insensitive regex matching any of the given literal keywords
+fn keywords_regex(keywords: &[&str]) -> Regex {
+    let alternation: Vec<String> = keywords.iter().map(|k| regex::escape(k)).collect();
+    Regex::new(&format!("(?i){}", alternation.join("|"))).expect("Invalid keywords regex")
+}
+
+/// `WILDCARD_ALLOWED_CONTEXTS` compiled once into a single alternation
+static WILDCARD_CONTEXT_RE: LazyLock<Regex> =
+    LazyLock::new(|| keywords_regex(WILDCARD_ALLOWED_CONTEXTS));
+
+/// `$filter` anywhere in the line
+static FILTER_RE: LazyLock<Regex> = LazyLock::new(|| keywords_regex(&["$filter"]));
+
+/// `SKIP_VALIDATION_CONTEXTS` compiled once into a single alternation
+static SKIP_VALIDATION_RE: LazyLock<Regex> =
+    LazyLock::new(|| keywords_regex(SKIP_VALIDATION_CONTEXTS));
+
+/// Number of preceding lines checked for a "bad example" marker
+pub const BAD_EXAMPLE_LOOKBACK: usize = 3;
+
 /// Example vendors used in documentation that are tolerated during vendor validation.
 /// These are placeholder/example vendors commonly used in docs and tutorials.
 pub const EXAMPLE_VENDORS: &[&str] = &[
@@ -103,59 +125,64 @@ pub fn is_example_vendor(vendor: &str) -> bool {
 #[must_use]
 pub fn is_wildcard_context(line: &str, match_start: usize) -> bool {
     // Use get() to safely handle potential mid-codepoint byte offsets
-    let before = match line.get(..match_start) {
-        Some(s) => s.to_lowercase(),
-        None => return false, // Invalid byte offset, assume not wildcard context
+    let Some(before) = line.get(..match_start) else {
+        return false; // Invalid byte offset, assume not wildcard context
     };
 
-    for ctx in WILDCARD_ALLOWED_CONTEXTS {
-        if before.contains(ctx) {
-            return true;
-        }
-    }
-
     // Also check for $filter anywhere in the line
-    if line.to_lowercase().contains("$filter") {
-        return true;
-    }
-
-    false
+    WILDCARD_CONTEXT_RE.is_match(before) || FILTER_RE.is_match(line)
 }
 
 /// Check if the GTS identifier is in a "bad example" context
 #[must_use]
 pub fn is_bad_example_context(line: &str, prev_lines: &[&str]) -> bool {
-    let line_lower = line.to_lowercase();
+    // Check current line, then previous lines (last BAD_EXAMPLE_LOOKBACK)
+    SKIP_VALIDATION_RE.is_match(line)
+        || prev_lines
+            .iter()
+            .rev()
+            .take(BAD_EXAMPLE_LOOKBACK)
+            .any(|prev_line| SKIP_VALIDATION_RE.is_match(prev_line))
+}
 
-    // Check current line
-    for ctx in SKIP_VALIDATION_CONTEXTS {
-        if line_lower.contains(ctx) {
-            return true;
-        }
-    }
+/// Reason a single GTS segment is malformed
+///
+/// Borrows the offending segment, so the message is only formatted when it is displayed.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, thiserror::Error)]
+pub enum SegmentError<'a> {
+    #[error("Hyphen not allowed in segment: '{segment}'")]
+    Hyphen { segment: &'a str },
 
-    // Check previous lines (last 3)
-    for prev_line in prev_lines.iter().rev().take(3) {
-        let prev_lower = prev_line.to_lowercase();
-        for ctx in SKIP_VALIDATION_CONTEXTS {
-            if prev_lower.contains(ctx) {
-                return true;
-            }
-        }
-    }
+    #[error(
+        "Segment must have 5 components (vendor.org.package.type.version), got {count}: '{segment}'"
+    )]
+    ComponentCount { count: usize, segment: &'a str },
+
+    #[error("Version must start with 'v' (e.g., v1, v1.0): '{segment}'")]
+    VersionPrefix { segment: &'a str },
+
+    #[error("Version number missing after 'v': '{segment}'")]
+    VersionMissing { segment: &'a str },
+
+    #[error("Version components must be numeric: '{segment}'")]
+    VersionNotNumeric { segment: &'a str },
+
+    #[error("Empty component at position {position}: '{segment}'")]
+    EmptyComponent { position: usize, segment: &'a str },
 
-    false
+    #[error("Components must be lowercase alphanumeric with underscores only: '{segment}'")]
+    InvalidComponent { segment: &'a str },
 }
 
 /// Validate a single GTS segment like 'x.core.modkit.plugin.v1'
-pub fn validate_gts_segment(segment: &str) -> Result<(), String> {
+pub fn validate_gts_segment(segment: &str) -> Result<(), SegmentError<'_>> {
     if segment.is_empty() {
         return Ok(()); // Empty segments are ok (trailing ~)
     }
 
     // Check for invalid characters
     if segment.contains('-') {
-        return Err(format!("Hyphen not allowed in segment: '{segment}'"));
+        return Err(SegmentError::Hyphen { segment });
     }
 
     let parts: Vec<&str> = segment.split('.').collect();
@@ -163,53 +190,43 @@ pub fn validate_gts_segment(segment: &str) -> Result<(), String> {
     // Must have 5 components: vendor.org.package.type.version
     // But version can be v1, v1.0, v1.2.3, etc.
     if parts.len() < 5 {
-        return Err(format!(
-            "Segment must have 5 components (vendor.org.package.type.version), got {}: '{segment}'",
-            parts.len()
-        ));
+        return Err(SegmentError::ComponentCount {
+            count: parts.len(),
+            segment,
+        });
     }
 
     // The 5th component must start with 'v' (version)
     if !parts[4].starts_with('v') {
-        return Err(format!(
-            "Version must start with 'v' (e.g., v1, v1.0): '{segment}'"
-        ));
+        return Err(SegmentError::VersionPrefix { segment });
     }
 
     // Validate version format
     let version_part = &parts[4][1..]; // Remove 'v' prefix
     if version_part.is_empty() {
-        return Err(format!("Version number missing after 'v': '{segment}'"));
+        return Err(SegmentError::VersionMissing { segment });
     }
 
     // Version parts must be numeric
-    let version_components: Vec<&str> = if parts.len() > 5 {
-        // v1.2.3 case: version spans multiple dot-separated parts
-        std::iter::once(version_part)
-            .chain(parts[5..].iter().copied())
-            .collect()
-    } else {
-        vec![version_part]
-    };
-
-    for vc in &version_components {
-        if vc.parse::<u32>().is_err() {
-            return Err(format!("Version components must be numeric: '{segment}'"));
-        }
+    // v1.2.3 case: version spans multiple dot-separated parts
+    let mut version_components = std::iter::once(version_part).chain(parts[5..].iter().copied());
+    if version_components.any(|vc| vc.parse::<u32>().is_err()) {
+        return Err(SegmentError::VersionNotNumeric { segment });
     }
 
     // Validate component format (lowercase alphanumeric + underscore)
     for (i, part) in parts[..4].iter().enumerate() {
         if part.is_empty() {
-            return Err(format!("Empty component at position {i}: '{segment}'"));
+            return Err(SegmentError::EmptyComponent {
+                position: i,
+                segment,
+            });
         }
         if !part
-            .chars()
-            .all(|c| c.is_ascii_lowercase() || c.is_ascii_digit() || c == '_')
+            .bytes()
+            .all(|b| b.is_ascii_lowercase() || b.is_ascii_digit() || b == b'_')
         {
-            return Err(format!(
-                "Components must be lowercase alphanumeric with underscores only: '{segment}'"
-            ));
+            return Err(SegmentError::InvalidComponent { segment });
         }
     }
 
@@ -286,7 +303,7 @@ pub fn validate_gts_id(
 
         for seg in &non_empty_segments {
             if let Err(e) = validate_gts_segment(seg) {
-                errors.push(e);
+                errors.push(e.to_string());
             }
         }
 
@@ -324,32 +341,80 @@ mod tests {
     use super::*;
 
     #[test]
-    fn test_valid_segment_standard() {
-        assert!(validate_gts_segment("x.core.modkit.plugin.v1").is_ok());
-    }
-
-    #[test]
-    fn test_valid_segment_with_underscores() {
-        assert!(validate_gts_segment("my_vendor.my_org.my_package.my_type.v1").is_ok());
-    }
-
-    #[test]
-    fn test_valid_segment_version_with_minor() {
-        assert!(validate_gts_segment("x.core.modkit.plugin.v1.2").is_ok());
+    fn test_valid_segments() {
+        for segment in [
+            "x.core.modkit.plugin.v1",
+            "my_vendor.my_org.my_package.my_type.v1",
+            "x.core.modkit.plugin.v1.2",
+            "x.core.modkit.plugin.v1.2.3",
+            "",
+        ] {
+            assert!(
+                validate_gts_segment(segment).is_ok(),
+                "Expected valid segment: '{segment}'"
+            );
+        }
     }
 
     #[test]
-    fn test_invalid_segment_hyphen() {
-        let result = validate_gts_segment("my-vendor.org.pkg.type.v1");
-        assert!(result.is_err());
-        assert!(result.unwrap_err().contains("Hyphen"));
+    fn test_invalid_segments() {
+        for (segment, expected) in [
+            (
+                "my-vendor.org.pkg.type.v1",
+                SegmentError::Hyphen {
+                    segment: "my-vendor.org.pkg.type.v1",
+                },
+            ),
+            (
+                "x.core.plugin.v1",
+                SegmentError::ComponentCount {
+                    count: 4,
+                    segment: "x.core.plugin.v1",
+                },
+            ),
+            (
+                "x.core.modkit.plugin.1",
+                SegmentError::VersionPrefix {
+                    segment: "x.core.modkit.plugin.1",
+                },
+            ),
+            (
+                "x.core.modkit.plugin.v",
+                SegmentError::VersionMissing {
+                    segment: "x.core.modkit.plugin.v",
+                },
+            ),
+            (
+                "x.core.modkit.plugin.vx",
+                SegmentError::VersionNotNumeric {
+                    segment: "x.core.modkit.plugin.vx",
+                },
+            ),
+            (
+                "x..modkit.plugin.v1",
+                SegmentError::EmptyComponent {
+                    position: 1,
+                    segment: "x..modkit.plugin.v1",
+                },
+            ),
+            (
+                "x.Core.modkit.plugin.v1",
+                SegmentError::InvalidComponent {
+                    segment: "x.Core.modkit.plugin.v1",
+                },
+            ),
+        ] {
+            assert_eq!(validate_gts_segment(segment), Err(expected));
+        }
     }
 
     #[test]
-    fn test_invalid_segment_too_few_components() {
-        let result = validate_gts_segment("x.core.plugin.v1");
-        assert!(result.is_err());
-        assert!(result.unwrap_err().contains("5 components"));
+    fn test_segment_error_messages() {
+        let err = validate_gts_segment("x.core.plugin.v1").unwrap_err();
+        assert_eq!(
+            err.to_string(),
+            "Segment must have 5 components (vendor.org.package.type.version), got 4: 'x.core.plugin.v1'"
+        );
     }
 
     #[test]
@@ -428,6 +493,11 @@ mod tests {
             "The type gts.x.core.type.v1~",
             "The type ".len()
         ));
+        assert!(is_wildcard_context(
+            "Use this PATTERN: gts.x.core.*",
+            "Use this PATTERN: ".len()
+        ));
+        assert!(is_wildcard_context("See $FILTER docs for gts.x.core.*", 0));
     }
 
     #[test]
@@ -438,5 +508,14 @@ mod tests {
             "The correct format is gts.x.core.type.v1~",
             &[]
         ));
+        // Keywords are matched case-insensitively, in the last 3 previous lines only
+        assert!(is_bad_example_context(
+            "gts.x.core.type.v1~",
+            &["## WRONG usage", "", ""]
+        ));
+        assert!(!is_bad_example_context(
+            "gts.x.core.type.v1~",
+            &["## WRONG usage", "", "", ""]
+        ));
     }
 }
@@ -9,15 +9,52 @@ Note: This script focuses on UI test results and ignores test_comment_annotation
 tests, which are developer-facing validation tests to ensure test annotations match stderr files.
 """
 
+import json
+import mmap
+import os
 import subprocess
 import re
+import signal
 import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11; only the cargo metadata fallback needs it
+    tomllib = None
 
-@dataclass
+
+# Lint code prefix of a lint crate name (e.g., "de0101_no_serde_in_contract" -> "de0101")
+_LINT_CRATE_RE = re.compile(r'(de\d{4})')
+
+# Lint description in lib.rs: the declare_lint! message, or the first "What it does" line
+_DESC_DECLARE_RE = re.compile(r'pub\s+([A-Z0-9_]+),\s*\n\s*Deny,\s*\n\s*"([^"]+)"')
+_DESC_DOC_RE = re.compile(r'/// ### What it does\s*\n\s*///\s*\n\s*/// ([^\n]+)')
+# Both appear in the module header, well before the lint implementation
+_DESC_READ_LIMIT = 8192
+
+# Error entries in .stderr files, matched on raw bytes; the first "(<CODE>)"
+# in the message is captured as the lint code
+# Format: error: <message>
+#         --> $DIR/<file>.rs:<line>:<col>
+_ERROR_RE = re.compile(
+    rb'error:\s*([^\n]*?(?:\(([A-Z]+\d+)\)[^\n]*)?)\n\s*-->\s*\$DIR/([^:]+):(\d+):'
+)
+
+# Failed UI tests and failed ui_examples tests in cargo test output
+_UI_FAIL_RE = re.compile(r"^test (?:\[ui\] .*?\.rs|tests::ui_examples) \.\.\.\s+FAILED")
+_UI_RESULT_RE = re.compile(r"^test \[ui\] .*?/([^/\s]+)\.rs \.\.\.\s+(ok|FAILED)")
+
+CARGO_TEST_TIMEOUT_SECS = 300
+
+
+@dataclass(slots=True)
 class Violation:
     """Represents a single lint violation"""
     file: str
@@ -26,7 +63,7 @@ class Violation:
     lint_code: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     """Represents a single test case (UI file)"""
     name: str
@@ -37,7 +74,7 @@ class TestCase:
     passed: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class LintPackage:
     """Represents a dylint lint package"""
     name: str
@@ -47,93 +84,71 @@ class LintPackage:
     test_cases: List[TestCase] = field(default_factory=list)
 
 
-def parse_toml_simple(content: str, key_path: List[str]) -> List[str]:
-    """Simple TOML parser for specific keys"""
-    lines = content.split('\n')
-    result = []
-    in_section = False
-    current_section = []
+def get_workspace_members(workspace_root: Path) -> List[Tuple[str, Path]]:
+    """List (package name, package directory) for every workspace member
     
-    for line in lines:
-        line = line.strip()
-        
-        # Check for section header
-        if line.startswith('[') and line.endswith(']'):
-            section = line[1:-1]
-            current_section = section.split('.')
-            in_section = current_section == key_path
-            continue
-        
-        # Parse key-value in the right section
-        if in_section and '=' in line:
-            continue
-        
-        # Parse array values in the right section
-        if in_section and line.startswith('"') and line.endswith('",'):
-            value = line.strip('"').rstrip(',')
-            result.append(value)
-        elif in_section and line.startswith('"') and line.endswith('"'):
-            value = line.strip('"')
-            result.append(value)
-    
-    return result
-
-
-def get_package_name_from_cargo(cargo_path: Path) -> str:
-    """Extract package name from Cargo.toml"""
-    content = cargo_path.read_text()
-    match = re.search(r'name\s*=\s*"([^"]+)"', content)
-    return match.group(1) if match else cargo_path.parent.name
+    Uses a single `cargo metadata` call; if cargo cannot provide metadata
+    (e.g. the pinned toolchain is not installed), falls back to reading the
+    workspace and package manifests with tomllib.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "cargo", "metadata", "--no-deps", "--format-version=1",
+                "--manifest-path", str(workspace_root / "Cargo.toml"),
+            ],
+            cwd=workspace_root,
+            capture_output=True,
+            check=True
+        )
+        # json.loads decodes the UTF-8 bytes itself; no text-mode pipe needed
+        metadata = json.loads(result.stdout)
+        return [
+            (package["name"], Path(package["manifest_path"]).parent)
+            for package in metadata["packages"]
+        ]
+    except (subprocess.CalledProcessError, OSError, json.JSONDecodeError) as e:
+        print(f"Warning: cargo metadata failed ({e}), reading Cargo.toml files instead")
+    
+    if tomllib is None:
+        print("Error: reading Cargo.toml files requires Python 3.11+ (tomllib)")
+        return []
+    
+    workspace = tomllib.loads((workspace_root / "Cargo.toml").read_text())
+    members = []
+    for member in workspace["workspace"]["members"]:
+        # Members may be glob patterns; a plain path globs to itself
+        for package_dir in sorted(workspace_root.glob(member)):
+            package_cargo = package_dir / "Cargo.toml"
+            if package_cargo.is_file():
+                manifest = tomllib.loads(package_cargo.read_text())
+                members.append((manifest["package"]["name"], package_dir))
+    return members
 
 
 def get_lint_packages(workspace_root: Path) -> List[LintPackage]:
     """Discover all lint packages in the workspace"""
     packages = []
     
-    cargo_toml = workspace_root / "Cargo.toml"
-    content = cargo_toml.read_text()
-    
-    # Parse members array manually
-    members = parse_toml_simple(content, ['workspace'])
-    if not members:
-        # Fallback: parse members manually with regex
-        match = re.search(r'\[workspace\].*?members\s*=\s*\[(.*?)\]', content, re.DOTALL)
-        if match:
-            members_str = match.group(1)
-            members = [m.strip().strip('"').strip(',') for m in members_str.split('\n') if m.strip()]
-    
-    # Discover packages by scanning directories
-    for lint_category in ['de01_contract_layer', 'de02_api_layer', 'de08_rest_api_conventions']:
-        category_dir = workspace_root / lint_category
-        if not category_dir.exists():
+    for package_name, package_dir in get_workspace_members(workspace_root):
+        # Only lint crates are named after their code (e.g., "de0101_no_serde_in_contract" -> "DE0101")
+        match = _LINT_CRATE_RE.match(package_name)
+        if not match:
             continue
+        lint_code = match.group(1).upper()
         
-        for package_dir in sorted(category_dir.iterdir()):
-            if not package_dir.is_dir():
-                continue
-            
-            package_cargo = package_dir / "Cargo.toml"
-            if not package_cargo.exists():
-                continue
-            
-            package_name = get_package_name_from_cargo(package_cargo)
-            
-            # Extract lint code from package name (e.g., "de0101_no_serde_in_contract" -> "DE0101")
-            match = re.match(r'(de\d{4})', package_name)
-            lint_code = match.group(1).upper() if match else "UNKNOWN"
-            
-            # Try to get description from src/lib.rs
-            lib_rs = package_dir / "src" / "lib.rs"
-            lint_description = get_lint_description(lib_rs)
-            
-            packages.append(LintPackage(
-                name=package_name,
-                path=package_dir,
-                lint_code=lint_code,
-                lint_description=lint_description
-            ))
+        # Try to get description from src/lib.rs
+        lib_rs = package_dir / "src" / "lib.rs"
+        lint_description = get_lint_description(lib_rs)
+        
+        packages.append(LintPackage(
+            name=package_name,
+            path=package_dir,
+            lint_code=lint_code,
+            lint_description=lint_description
+        ))
     
-    return sorted(packages, key=lambda p: p.name)
+    return packages
 
 
 def get_lint_description(lib_rs: Path) -> str:
@@ -141,17 +156,12 @@ def get_lint_description(lib_rs: Path) -> str:
     if not lib_rs.exists():
         return "Unknown"
     
-    with open(lib_rs) as f:
-        content = f.read()
+    with open(lib_rs, "rb") as f:
+        content = f.read(_DESC_READ_LIMIT).decode("utf-8", "replace")
     
     # Look for the lint declaration and extract description
-    patterns = [
-        r'pub\s+([A-Z0-9_]+),\s*\n\s*Deny,\s*\n\s*"([^"]+)"',
-        r'/// ### What it does\s*\n\s*///\s*\n\s*/// ([^\n]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content)
+    for pattern in (_DESC_DECLARE_RE, _DESC_DOC_RE):
+        match = pattern.search(content)
         if match:
             desc = match.group(1) if len(match.groups()) == 1 else match.group(2)
             return desc.strip()
@@ -166,28 +176,20 @@ def parse_stderr_file(stderr_path: Path) -> List[Violation]:
     if not stderr_path.exists():
         return violations
     
-    content = stderr_path.read_text()
-    
-    # Parse error messages
-    # Format: error: <message>
-    #         --> $DIR/<file>.rs:<line>:<col>
-    error_pattern = r'error:\s*([^\n]+)\n\s*-->\s*\$DIR/([^:]+):(\d+):'
-    
-    for match in re.finditer(error_pattern, content):
-        message = match.group(1).strip()
-        file = match.group(2)
-        line = int(match.group(3))
-        
-        # Extract lint code from message
-        lint_code_match = re.search(r'\(([A-Z]+\d+)\)', message)
-        lint_code = lint_code_match.group(1) if lint_code_match else "UNKNOWN"
-        
-        violations.append(Violation(
-            file=file,
-            line=line,
-            message=message,
-            lint_code=lint_code
-        ))
+    with open(stderr_path, "rb") as f:
+        # mmap cannot map empty files; those contain no violations anyway
+        if stderr_path.stat().st_size == 0:
+            return violations
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            for match in _ERROR_RE.finditer(content):
+                message, lint_code, file, line = match.groups()
+                
+                violations.append(Violation(
+                    file=file.decode("utf-8", "replace"),
+                    line=int(line),
+                    message=message.decode("utf-8", "replace").strip(),
+                    lint_code=lint_code.decode("ascii") if lint_code else "UNKNOWN"
+                ))
     
     return violations
 
@@ -197,11 +199,17 @@ def discover_test_cases(package: LintPackage) -> List[TestCase]:
     test_cases = []
     ui_dir = package.path / "ui"
     
-    if not ui_dir.exists():
+    # Find all .rs files in ui/; scandir serves the file type from the directory
+    # listing, so no extra stat or pattern matching is needed per entry
+    try:
+        with os.scandir(ui_dir) as it:
+            # Order does not matter here: the report sorts test cases by name
+            rs_names = [e.name for e in it if e.name.endswith(".rs") and e.is_file()]
+    except FileNotFoundError:
         return test_cases
     
-    # Find all .rs files in ui/
-    for rs_file in sorted(ui_dir.glob("*.rs")):
+    for rs_name in rs_names:
+        rs_file = ui_dir / rs_name
         stderr_file = rs_file.with_suffix(".stderr")
         
         violations = parse_stderr_file(stderr_file)
@@ -219,65 +227,120 @@ def discover_test_cases(package: LintPackage) -> List[TestCase]:
     return test_cases
 
 
-def run_cargo_test(workspace_root: Path) -> Tuple[bool, str]:
-    """Run cargo test for all lint packages"""
+def run_cargo_test(workspace_root: Path) -> Tuple[bool, Dict[str, bool]]:
+    """Run cargo test for all lint packages
+    
+    Output is streamed and parsed line by line while cargo runs, so it is never
+    buffered in full. Returns (success, UI test statuses by test file stem);
+    statuses exclude test_comment_annotations_match_stderr tests.
+    """
     print("Building dylint lints...\n")
     
+    statuses: Dict[str, bool] = {}
+    has_ui_failures = False
+    
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             ["cargo", "test", "--no-fail-fast"],
             cwd=workspace_root,
-            capture_output=True,
-            text=True,
-            timeout=300
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            # cargo always emits UTF-8; don't depend on the locale codec
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            # Own process group, so a timeout can kill rustc and test binaries too
+            start_new_session=True
         )
-        
-        output = result.stdout + result.stderr
-        
-        # Check if UI tests passed (ignore test_comment_annotations_match_stderr tests)
-        # We look for failures in ui_examples tests specifically
-        success = result.returncode == 0 or not has_ui_test_failures(output)
-        
-        return success, output
-    except subprocess.TimeoutExpired:
-        return False, "Test execution timed out"
     except Exception as e:
-        return False, f"Failed to run tests: {e}"
-
-
-def has_ui_test_failures(cargo_output: str) -> bool:
-    """Check if there are any UI test failures (excluding comment annotation tests)"""
-    lines = cargo_output.splitlines()
+        print(f"Error: Failed to run tests: {e}")
+        return False, statuses
     
-    for line in lines:
-        # Check for failed UI tests
-        if re.search(r"^test \[ui\] .*?\.rs \.\.\.\s+FAILED", line):
-            return True
-        # Check for failed ui_examples tests
-        if re.search(r"^test tests::ui_examples \.\.\.\s+FAILED", line):
-            return True
+    timed_out = threading.Event()
     
-    return False
+    def kill_process_group():
+        try:
+            if hasattr(os, "killpg"):
+                # cargo's children hold the pipe open, so kill the whole group
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except OSError:
+            pass
+    
+    def kill_on_timeout():
+        if proc.poll() is not None:
+            # Finished right at the deadline, not a timeout
+            return
+        timed_out.set()
+        kill_process_group()
+    
+    # Reading the pipe blocks, so the timeout is enforced by killing cargo
+    timer = threading.Timer(CARGO_TEST_TIMEOUT_SECS, kill_on_timeout)
+    timer.start()
+    try:
+        with proc:
+            try:
+                for line in proc.stdout:
+                    # Individual UI test results; stored by test stem, matched to packages later
+                    m = _UI_RESULT_RE.match(line)
+                    if m:
+                        statuses[m.group(1)] = m.group(2) == "ok"
+                    # Failed UI tests or ui_examples tests
+                    if not has_ui_failures and _UI_FAIL_RE.match(line):
+                        has_ui_failures = True
+            except BaseException:
+                # cargo runs in its own session, so Ctrl-C never reaches it;
+                # don't leave the test tree running orphaned
+                if proc.poll() is None:
+                    kill_process_group()
+                raise
+            returncode = proc.wait()
+    finally:
+        timer.cancel()
+    
+    if timed_out.is_set():
+        print("Error: Test execution timed out")
+        return False, statuses
+    
+    # Check if UI tests passed (ignore test_comment_annotations_match_stderr tests)
+    # We look for failures in ui_examples tests specifically
+    return returncode == 0 or not has_ui_failures, statuses
 
 
-def parse_ui_test_statuses(cargo_output_stdout: str, cargo_output_stderr: str) -> Dict[Tuple[str, str], bool]:
-    """Parse UI test statuses from cargo output
+@dataclass
+class ReportData:
+    """Aggregates needed for the report, collected in a single pass"""
+    grouped: defaultdict[str, List[TestCase]] = field(default_factory=lambda: defaultdict(list))
+    # lint code -> (test name, line, violation), so the report can sort by itemgetter(0, 1)
+    violations_by_lint: defaultdict[str, List[Tuple[str, int, Violation]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    passed: int = 0
+    failed: int = 0
+    expected_violations: int = 0
+
+
+def build_report(packages: List[LintPackage]) -> ReportData:
+    """Group test cases and violations by lint and count results in one traversal"""
+    report = ReportData()
     
-    Returns only UI test results, excluding test_comment_annotations_match_stderr tests.
-    """
-    statuses: Dict[Tuple[str, str], bool] = {}
+    for package in packages:
+        for tc in package.test_cases:
+            report.grouped[f"{tc.lint_code}: {tc.lint_name}"].append(tc)
+            
+            if tc.passed:
+                report.passed += 1
+            else:
+                report.failed += 1
+            
+            report.expected_violations += len(tc.violations)
+            for violation in tc.violations:
+                report.violations_by_lint[violation.lint_code].append(
+                    (tc.name, violation.line, violation)
+                )
     
-    # Parse all test results from stdout
-    for line in cargo_output_stdout.splitlines():
-        # Look for individual UI test results
-        m = re.search(r"^test \[ui\] .*?/([^/\s]+)\.rs \.\.\.\s+(ok|FAILED)", line)
-        if m:
-            test_stem = m.group(1)
-            result = m.group(2)
-            # Store without crate name for now - we'll match it later
-            statuses[test_stem] = result == "ok"
-
-    return statuses
+    return report
 
 
 def print_test_header():
@@ -287,88 +350,70 @@ def print_test_header():
     print("\nCompiling with dylint (nightly)...\n")
 
 
-def print_test_case_results(test_cases: List[TestCase], all_passed: bool):
+def print_test_case_results(report: ReportData):
     """Print formatted results for all test cases"""
-    # Group test cases by lint code
-    grouped = {}
-    for tc in test_cases:
-        lint_key = f"{tc.lint_code}: {tc.lint_name}"
-        if lint_key not in grouped:
-            grouped[lint_key] = []
-        grouped[lint_key].append(tc)
+    grouped = report.grouped
     
     total_lints = len(grouped)
-    total_tests = len(test_cases)
+    total_tests = report.passed + report.failed
     print(f"Testing {total_lints} lint(s) with {total_tests} test file(s)\n")
     
     for lint_key in sorted(grouped.keys()):
         test_group = grouped[lint_key]
-        first_tc = test_group[0]
-        
-        print(f"→ {lint_key}")
-        print("  " + "─" * 66)
+        # Each lint section is buffered and written with a single call
+        out = [f"→ {lint_key}\n", "  " + "─" * 66 + "\n"]
         
         all_group_passed = all(tc.passed for tc in test_group)
         status = "✓ PASS" if all_group_passed else "✗ FAIL"
-        print(f"  {status}")
+        out.append(f"  {status}\n")
         
         # Print test results grouped by test file
-        for tc in sorted(test_group, key=lambda x: x.name):
+        for tc in sorted(test_group, key=attrgetter("name")):
             expected_label = "Expected: Triggered" if tc.violations else "Expected: Success"
             symbol = "✓" if tc.passed else "✗"
-            print(f"    {symbol} {tc.name}.rs: {expected_label}")
+            out.append(f"    {symbol} {tc.name}.rs: {expected_label}\n")
 
             if tc.violations:
                 for v in tc.violations:
-                    print(f"        - line {v.line}: {v.message}")
+                    out.append(f"        - line {v.line}: {v.message}\n")
         
-        print()
+        out.append("\n")
+        sys.stdout.write("".join(out))
 
 
 
 
-def print_violations_by_lint(packages: List[LintPackage]):
+def print_violations_by_lint(report: ReportData):
     """Print all violations grouped by lint code"""
     print("=" * 70)
     print("\nAll Violations by Lint:\n")
     
-    # Collect all violations by lint code
-    violations_by_lint: Dict[str, List[Tuple[str, Violation]]] = {}
-    
-    for package in packages:
-        for test_case in package.test_cases:
-            for violation in test_case.violations:
-                lint_code = violation.lint_code
-                if lint_code not in violations_by_lint:
-                    violations_by_lint[lint_code] = []
-                violations_by_lint[lint_code].append((test_case.name, violation))
+    violations_by_lint = report.violations_by_lint
     
     # Print violations by lint
     for lint_code in sorted(violations_by_lint.keys()):
         violations = violations_by_lint[lint_code]
         count = len(violations)
         
-        print(f"  {lint_code} ({count} violation{'s' if count != 1 else ''}):")
+        # Each lint section is buffered and written with a single call
+        out = [f"  {lint_code} ({count} violation{'s' if count != 1 else ''}):\n"]
         
-        for test_name, violation in sorted(violations, key=lambda x: (x[0], x[1].line)):
-            # Clean up the message
-            clean_message = violation.message
-            print(f"    {test_name}.rs:{violation.line}: {clean_message}")
+        for test_name, _, violation in sorted(violations, key=itemgetter(0, 1)):
+            out.append(f"    {test_name}.rs:{violation.line}: {violation.message}\n")
         
-        print()
+        out.append("\n")
+        sys.stdout.write("".join(out))
 
 
-def print_summary(packages: List[LintPackage], all_tests_passed: bool, total_violations: int):
+def print_summary(report: ReportData, all_tests_passed: bool):
     """Print test summary"""
     print("=" * 70)
     print("\nSummary:")
 
-    passed = sum(1 for p in packages for tc in p.test_cases if tc.passed)
-    failed = sum(1 for p in packages for tc in p.test_cases if not tc.passed)
+    passed = report.passed
+    failed = report.failed
     total_tests = passed + failed
-    
-    # Count expected violations
-    expected_violations = sum(len(tc.violations) for p in packages for tc in p.test_cases)
+    expected_violations = report.expected_violations
     
     print(f"  Tests: {passed} passed, {failed} failed, {total_tests} total")
     
@@ -390,26 +435,15 @@ def main():
     # Discover all lint packages
     packages = get_lint_packages(workspace_root)
     
-    # Discover test cases for each package
-    for package in packages:
-        package.test_cases = discover_test_cases(package)
+    # Discover test cases for each package; reading .stderr files is I/O bound,
+    # so packages are scanned concurrently
+    if packages:
+        with ThreadPoolExecutor(max_workers=min(32, len(packages))) as executor:
+            for package, test_cases in zip(packages, executor.map(discover_test_cases, packages)):
+                package.test_cases = test_cases
     
-    # Run cargo test
-    cargo_tests_passed, output = run_cargo_test(workspace_root)
-
-    # Parse UI test statuses from cargo output
-    try:
-        result = subprocess.run(
-            ["cargo", "test", "--no-fail-fast"],
-            cwd=workspace_root,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-        ui_statuses_by_name = parse_ui_test_statuses(result.stdout, result.stderr)
-    except Exception as e:
-        print(f"Warning: Failed to parse test statuses: {e}")
-        ui_statuses_by_name = {}
+    # Run cargo test and collect UI test statuses from its output
+    cargo_tests_passed, ui_statuses_by_name = run_cargo_test(workspace_root)
     
     # Update test case pass/fail status based on parsed output
     # Match test names to packages
@@ -422,28 +456,22 @@ def main():
                 # If test wasn't found in output, mark as failed if overall cargo test failed
                 tc.passed = cargo_tests_passed
     
+    # Collect everything the report needs in one pass
+    report = build_report(packages)
+    
     # Print formatted output
     print_test_header()
-    
-    # Collect all test cases
-    all_test_cases = []
-    for package in packages:
-        all_test_cases.extend(package.test_cases)
-    
-    print_test_case_results(all_test_cases, cargo_tests_passed)
-    print_violations_by_lint(packages)
-    
-    # Count expected violations from .stderr files
-    expected_violations = sum(len(tc.violations) for p in packages for tc in p.test_cases)
+    print_test_case_results(report)
+    print_violations_by_lint(report)
     
     # Determine overall success:
     # 1. All UI test cases must have passed (tc.passed == True)
     # 2. Cargo test must have passed (cargo_tests_passed)
     # Note: We ignore test_comment_annotations_match_stderr tests in success determination
     # as those are developer-facing validation tests, not lint behavior tests
-    all_tests_passed = cargo_tests_passed and all(tc.passed for p in packages for tc in p.test_cases)
+    all_tests_passed = cargo_tests_passed and report.failed == 0
     
-    print_summary(packages, all_tests_passed, expected_violations)
+    print_summary(report, all_tests_passed)
     
     sys.exit(0 if all_tests_passed else 1)
 
@@ -10,6 +10,7 @@ import sys
 import logging
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 # Add the scripts directory to the path so we can import our modules
@@ -66,33 +67,38 @@ def check_all_prereqs(prereq_list=None) -> bool:
     total = len(prereq_list)
     prereqs_with_remediation = []
 
-    for prereq_class in prereq_list:
-        prereq = prereq_class()
-        prereq_name = prereq.name
-
-        # Print the prerequisite name with padding
-        print(f"  {prereq_name:<55} ... ", end="", flush=True)
-
-        try:
-            # Temporarily suppress logging for individual checks
-            old_level = logging.getLogger().level
-            logging.getLogger().setLevel(logging.CRITICAL)
-
-            result = prereq.check()
-
-            # Restore logging level
-            logging.getLogger().setLevel(old_level)
-
-            if result in [PRECHECK_OK, PRECHECK_WARNING]:
-                passed += 1
-            else:
-                prereqs_with_remediation.append(prereq)
-
-            print(result)
-
-        except Exception as e:
-            print(f"ERROR: {str(e)}")
-            prereqs_with_remediation.append(prereq)
+    prereqs = [prereq_class() for prereq_class in prereq_list]
+
+    # Suppress logging for the checks; the level is process-wide, so it is
+    # set once around the whole pool rather than per (concurrent) check
+    old_level = logging.getLogger().level
+    logging.getLogger().setLevel(logging.CRITICAL)
+    try:
+        # Checks are independent I/O-bound probes (process spawns, HTTP),
+        # so run them concurrently and report in submission order
+        with ThreadPoolExecutor(max_workers=min(16, max(1, total))) as executor:
+            futures = [executor.submit(prereq.check) for prereq in prereqs]
+
+            for prereq, future in zip(prereqs, futures):
+                # Print the prerequisite name with padding
+                print(f"  {prereq.name:<55} ... ", end="", flush=True)
+
+                try:
+                    result = future.result()
+
+                    if result in [PRECHECK_OK, PRECHECK_WARNING]:
+                        passed += 1
+                    else:
+                        prereqs_with_remediation.append(prereq)
+
+                    print(result)
+
+                except Exception as e:
+                    print(f"ERROR: {str(e)}")
+                    prereqs_with_remediation.append(prereq)
+    finally:
+        # Restore logging level
+        logging.getLogger().setLevel(old_level)
 
     print_ascii_footer(passed, total, prereqs_with_remediation)
 
@@ -1,28 +1,108 @@
 #!/usr/bin/env python
 import argparse
+import hashlib
+import importlib.util
+import json
 import os
+import re
+import selectors
 import shutil
+import socket
 import subprocess
 import sys
+import threading
 import time
-from urllib.request import urlopen
-from urllib.error import URLError, HTTPError
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urlsplit
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PYTHON = sys.executable or "python"
+# hyperspot-server features needed by config/e2e-local.yaml
+E2E_SERVER_FEATURES = ("users-info-example",)
+# Logged by api-gateway once the HTTP listener is bound
+SERVER_READY_PATTERN = re.compile(rb"HTTP server bound on")
 
 
-def run_cmd(cmd, env=None, cwd=None):
-    print(f"> {' '.join(cmd)}")
-    result = subprocess.run(cmd, env=env, cwd=cwd)
+# Set per worker thread by run_parallel: the stage's output buffer, so
+# concurrent stages don't interleave, and extra env vars for those stages
+_OUTPUT = threading.local()
+_OUTPUT_LOCK = threading.Lock()
+
+
+class StageOutput:
+    """sys.stdout stand-in that sends writes from stage threads to their buffer.
+
+    Threads without a buffer (the main thread) write through unchanged.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buffer = getattr(_OUTPUT, "buffer", None)
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        if getattr(_OUTPUT, "buffer", None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def run_cmd(cmd, env=None, cwd=None, capture=None):
+    result = run_cmd_allow_fail(cmd, env=env, cwd=cwd, capture=capture)
     if result.returncode != 0:
         sys.exit(result.returncode)
     return result
 
 
-def run_cmd_allow_fail(cmd, env=None, cwd=None):
-    print(f"> {' '.join(cmd)}")
-    return subprocess.run(cmd, env=env, cwd=cwd)
+def run_cmd_allow_fail(cmd, env=None, cwd=None, capture=None):
+    """Run cmd, streaming its output, or collecting it when capture is set.
+
+    Captured output is written to sys.stdout once the command finishes.
+    capture defaults to on inside run_parallel stages, whose stdout is
+    buffered per stage anyway.
+    """
+    if capture is None:
+        capture = getattr(_OUTPUT, "buffer", None) is not None
+    stage_env = getattr(_OUTPUT, "env", None)
+    if stage_env:
+        env = make_env(**stage_env) if env is None else {**stage_env, **env}
+    if not capture:
+        print(f"> {' '.join(cmd)}", flush=True)
+        return subprocess.run(cmd, env=env, cwd=cwd)
+    result = subprocess.run(
+        cmd,
+        env=env,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    print(f"> {' '.join(cmd)}\n{result.stdout}", end="", flush=True)
+    return result
+
+
+def make_env(**overrides):
+    """Child environment with overrides; None (inherit as is) if there are none."""
+    if not overrides:
+        return None
+    return {**os.environ, **overrides}
 
 
 def step(msg):
@@ -80,15 +160,62 @@ def cmd_clippy(args):
             sys.exit(result.returncode)
 
 
-def cmd_test(_args):
-    step("Running cargo test")
-    run_cmd(["cargo", "test", "--workspace"])
+def default_test_jobs():
+    # Leave a couple of cores for the build and the rest of the system
+    return max(1, (os.cpu_count() or 1) - 2)
+
+
+def test_cmd(args, cargo_args, test_args=()):
+    """Build a test command for cargo-nextest, or plain cargo test with --legacy."""
+    if getattr(args, "legacy", False):
+        cmd = ["cargo", "test", *cargo_args]
+        if test_args:
+            cmd.extend(["--", *test_args])
+        return cmd
+    jobs = getattr(args, "jobs", None) or default_test_jobs()
+    return [
+        "cargo", "nextest", "run", *cargo_args,
+        "--profile", "ci", "--test-threads", str(jobs),
+        *test_args,
+    ]
+
+
+def cmd_test(args):
+    if getattr(args, "legacy", False):
+        step("Running cargo test")
+        run_cmd(test_cmd(args, ["--workspace"]))
+    else:
+        step("Running cargo nextest")
+        ensure_tool("cargo-nextest", "cargo install cargo-nextest --locked")
+        run_cmd(test_cmd(args, ["--workspace"]))
+        # nextest does not run doctests
+        run_cmd(["cargo", "test", "--workspace", "--doc"])
     print("All tests passed")
 
 
+# Probe results keyed by command, so repeated stages don't respawn them
+_TOOL_CACHE: dict[tuple[str, ...], bool] = {}
+
+
+def probe_cmd(cmd):
+    """Return True if cmd runs successfully; output is discarded."""
+    key = tuple(cmd)
+    if key not in _TOOL_CACHE:
+        try:
+            result = subprocess.run(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            _TOOL_CACHE[key] = result.returncode == 0
+        except OSError:
+            _TOOL_CACHE[key] = False
+    return _TOOL_CACHE[key]
+
+
 def ensure_tool(binary, install_hint=None):
-    result = run_cmd_allow_fail([binary, "--version"])
-    if result.returncode != 0:
+    if not probe_cmd([binary, "--version"]):
         msg = f"{binary} is not installed"
         if install_hint:
             msg += f". Install with: {install_hint}"
@@ -193,16 +320,100 @@ def cmd_cypilot_validate(_args):
         sys.exit(result.returncode)
 
 
-def cmd_check(args):
-    step("Running full check suite")
-    cmd_fmt(args)
-    cmd_cypilot_validate(args)
-    cmd_clippy(args)
-    cmd_test(args)
+def run_stage(stage, args, env=None, stream=None):
+    """Run a cmd_* stage and return its exit code instead of exiting.
+
+    Everything the stage prints, including the output of its commands, is
+    written to stream as one block once it finishes.
+    """
+    _OUTPUT.buffer = []
+    _OUTPUT.env = env
+    try:
+        stage(args)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except Exception:
+        # e.g. a missing tool binary; report it as this stage failing
+        _OUTPUT.buffer.append(traceback.format_exc())
+        return 1
+    finally:
+        text = "".join(_OUTPUT.buffer)
+        _OUTPUT.buffer = None
+        _OUTPUT.env = None
+        stream = stream or sys.stdout
+        with _OUTPUT_LOCK:
+            stream.write(text)
+            stream.flush()
+    return 0
+
+
+def run_parallel(stages, args, env=None):
+    """Run independent stages concurrently and exit if any of them failed.
+
+    env holds extra variables for the commands these stages launch; values
+    already set in the environment take precedence.
+    """
+    failed = []
+    workers = max(2, (os.cpu_count() or 1) - 2)
+    stream = sys.stdout
+    sys.stdout = StageOutput(stream)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(run_stage, stage, args, env, stream): stage
+                for stage in stages
+            }
+            for future in as_completed(futures):
+                if future.result() != 0:
+                    failed.append(futures[future].__name__)
+    finally:
+        sys.stdout = stream
+    if failed:
+        print(f"\nFailed stages: {', '.join(sorted(failed))}")
+        sys.exit(1)
+
+
+def cmd_dylint_all(args):
+    # Both stages build dylint_lints, so keep them in order
     cmd_dylint_test(args)
     cmd_dylint(args)
-    cmd_gts_docs(args)
-    cmd_security(args)
+
+
+def parallel_cargo_env(concurrent_builds=2):
+    """Env vars splitting the cores between cargo builds run at the same time.
+
+    Separate cargo processes don't share a jobserver, so without a limit
+    each of them would spawn one job per core. Only meant for run_parallel;
+    serial builds should keep every core.
+    """
+    env = {}
+    if "CARGO_BUILD_JOBS" not in os.environ:
+        cpus = max(1, (os.cpu_count() or 1) - 2)
+        env["CARGO_BUILD_JOBS"] = str(max(1, cpus // concurrent_builds))
+    if os.environ.get("CI") and "CARGO_INCREMENTAL" not in os.environ:
+        # Same as the GitHub workflows: incremental data is wasted on CI
+        env["CARGO_INCREMENTAL"] = "0"
+    return env
+
+
+def cmd_check(args):
+    step("Running full check suite")
+    if args.fix:
+        # Fixes rewrite sources, so they must not overlap with anything else
+        cmd_fmt(args)
+        cmd_clippy(args)
+        stages = []
+    else:
+        stages = [cmd_fmt, cmd_clippy]
+    # Read-only checks; cargo serializes access to target/ by itself
+    stages += [cmd_cypilot_validate, cmd_gts_docs, cmd_audit, cmd_deny]
+    run_parallel(stages, args)
+    # Workspace tests run alongside the dylint stages: the dylint UI tests and
+    # lint libraries build in dylint_lints/target, then cargo dylint checks
+    # the workspace sources with the pinned nightly toolchain
+    run_parallel([cmd_test, cmd_dylint_all], args, env=parallel_cargo_env())
     print("All checks passed")
 
 
@@ -226,38 +437,109 @@ def cmd_quickstart(_args):
     )
 
 
-def wait_for_health(base_url, timeout_secs=30):
+def print_log_tail(path, lines=50):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            tail = deque(f, maxlen=lines)
+    except OSError:
+        return
+    print(f"--- last {len(tail)} lines of {path} ---")
+    print("".join(tail), end="")
+
+
+def wait_for_process_exit(process, pidfd, delay):
+    """Wait up to delay seconds, returning True early if process exits."""
+    if pidfd is None:
+        time.sleep(delay)
+        return process.poll() is not None
+    with selectors.DefaultSelector() as sel:
+        sel.register(pidfd, selectors.EVENT_READ)
+        return bool(sel.select(timeout=delay))
+
+
+def wait_for_log_line(path, pattern, timeout_secs, server_process):
+    """Tail path until a line matches pattern.
+
+    Returns False on timeout or if server_process exits first; the caller
+    falls back to regular health polling in that case.
+    """
+    step(f"Waiting for server start in {path}")
+    deadline = time.monotonic() + timeout_secs
+    pending = b""
+    with open(path, "rb") as f:
+        while time.monotonic() < deadline:
+            chunk = f.read()
+            if chunk:
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                if any(pattern.search(line) for line in lines):
+                    return True
+                continue
+            if server_process.poll() is not None:
+                return False
+            time.sleep(0.025)
+    return False
+
+
+def wait_for_health(base_url, timeout_secs=30, server_process=None, error_log=None):
     url = f"{base_url.rstrip('/')}/healthz"
     step(f"Waiting for API to be ready at {url}")
-    start = time.time()
+    parts = urlsplit(url)
+    conn_cls = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+    # Reuse one keep-alive connection across probes
+    conn = conn_cls(parts.hostname, parts.port, timeout=1)
+    deadline = time.monotonic() + timeout_secs
     attempt = 0
-    while True:
+    delay = 0.025
+    pidfd = None
+    if server_process is not None and hasattr(os, "pidfd_open"):
         try:
-            attempt += 1
-            with urlopen(url, timeout=1) as resp:
+            pidfd = os.pidfd_open(server_process.pid)
+        except OSError:
+            # Kernel without pidfd support, fall back to polling
+            pidfd = None
+    try:
+        while True:
+            try:
+                attempt += 1
+                conn.request("GET", parts.path)
+                resp = conn.getresponse()
+                resp.read()
                 if 200 <= resp.status < 300:
                     print(f"API is ready (after {attempt} attempts)")
                     return
-        except (URLError, HTTPError, ConnectionResetError, OSError) as e:
-            # Server may be starting up or restarting
-            if attempt % 10 == 0:  # Log every 10 attempts
-                print(f"Still waiting... (attempt {attempt}, error: {type(e).__name__})")
-
-        if time.time() - start > timeout_secs:
-            print(f"ERROR: The API readiness check timed out after {attempt} attempts")
-            sys.exit(1)
-        time.sleep(1)
+                if attempt % 10 == 0:  # Log every 10 attempts
+                    print(f"Still waiting... (attempt {attempt}, status: {resp.status})")
+            except (HTTPException, OSError) as e:
+                # Server may be starting up or restarting; reconnect next time
+                conn.close()
+                if attempt % 10 == 0:  # Log every 10 attempts
+                    print(f"Still waiting... (attempt {attempt}, error: {type(e).__name__})")
+
+            if time.monotonic() > deadline:
+                print(f"ERROR: The API readiness check timed out after {attempt} attempts")
+                sys.exit(1)
+            if server_process is None:
+                time.sleep(delay)
+            elif wait_for_process_exit(server_process, pidfd, delay):
+                code = server_process.wait()
+                print(f"ERROR: Server exited with code {code} before becoming ready")
+                if error_log:
+                    print_log_tail(error_log)
+                sys.exit(1)
+            delay = min(0.5, delay * 2)
+    finally:
+        conn.close()
+        if pidfd is not None:
+            os.close(pidfd)
 
 
 def check_pytest():
     step("Checking pytest")
-    # First try "python -m pytest"
-    result = run_cmd_allow_fail([PYTHON, "-m", "pytest", "--version"])
-    if result.returncode == 0:
+    # First try "python -m pytest", then "pytest" directly
+    if probe_cmd([PYTHON, "-m", "pytest", "--version"]):
         return
-    # Then try "pytest" directly
-    result = run_cmd_allow_fail(["pytest", "--version"])
-    if result.returncode == 0:
+    if probe_cmd(["pytest", "--version"]):
         return
     print(
         "ERROR: pytest is not installed. Install with: "
@@ -266,26 +548,48 @@ def check_pytest():
     sys.exit(1)
 
 
+def port_in_use(port, host="127.0.0.1"):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.05)
+        return sock.connect_ex((host, int(port))) == 0
+
+
 def kill_existing_server(port):
     """Kill any existing server process on the specified port"""
     try:
-        # Find process using the port
+        # Nothing listening, nothing to kill
+        if not port_in_use(port):
+            return
+        print(f"Killing existing server process on port {port}")
         if sys.platform == "darwin":  # macOS
-            result = run_cmd_allow_fail(["lsof", "-ti", f":{port}"])
+            result = subprocess.run(
+                ["lsof", "-ti", f":{port}"], capture_output=True, text=True
+            )
+            for pid in result.stdout.split():
+                run_cmd_allow_fail(["kill", "-9", pid])
         else:  # Linux and others
-            result = run_cmd_allow_fail(["fuser", "-k", f"{port}/tcp"])
+            run_cmd_allow_fail(["fuser", "-k", "-9", f"{port}/tcp"])
 
-        if result.returncode == 0 and result.stdout:
-            pids = result.stdout.strip().split()
-            for pid in pids:
-                print(f"Killing existing server process {pid} on port {port}")
-                run_cmd_allow_fail(["kill", "-9", pid])
-                time.sleep(1)  # Give it time to die
+        # Give it time to die
+        deadline = time.monotonic() + 5
+        while port_in_use(port) and time.monotonic() < deadline:
+            time.sleep(0.05)
     except Exception:
         # If we can't find or kill the process, continue anyway
         pass
 
 
+def release_server_path(name="hyperspot-server"):
+    exe = f"{name}.exe" if sys.platform == "win32" else name
+    target_dir = os.environ.get("CARGO_TARGET_DIR") or os.path.join(PROJECT_ROOT, "target")
+    return os.path.join(target_dir, "release", exe)
+
+
+def prebuilt_server_path():
+    """Release server with E2E_SERVER_FEATURES, kept apart from the plain build."""
+    return release_server_path("hyperspot-server-e2e")
+
+
 def cmd_e2e(args):
     base_url = os.environ.get("E2E_BASE_URL", "http://localhost:8086")
     check_pytest()
@@ -320,6 +624,7 @@ def cmd_e2e(args):
             "testing/docker/hyperspot.Dockerfile",
             "-t",
             "hyperspot-api:e2e",
+            "--progress=plain",
         ]
 
         # Add build args for cargo features if specified
@@ -327,7 +632,8 @@ def cmd_e2e(args):
             build_cmd.extend(["--build-arg", f"CARGO_FEATURES={args.features}"])
 
         build_cmd.append(".")
-        run_cmd(build_cmd)
+        # BuildKit is required for the cargo cache mounts in the Dockerfile
+        run_cmd(build_cmd, env=make_env(DOCKER_BUILDKIT="1"))
 
         # Start environment
         step("Starting E2E docker-compose environment")
@@ -340,11 +646,16 @@ def cmd_e2e(args):
                 "up",
                 "--force-recreate",
                 "-d",
+                # Block until containers run and healthchecks (mock) pass
+                "--wait",
+                "--wait-timeout",
+                "60",
             ]
         )
         docker_env_started = True
 
-        # Wait for healthz
+        # The API service has no compose healthcheck (the slim image has no
+        # HTTP client), so confirm /healthz from here
         wait_for_health(base_url)
     else:
         step("Running E2E tests in local mode")
@@ -359,17 +670,25 @@ def cmd_e2e(args):
             os.makedirs(logs_dir, exist_ok=True)
 
             # Start server in background with logs redirected to files
-            server_cmd = [
-                "cargo",
-                "run",
-                "--bin",
-                "hyperspot-server",
-                "--features",
-                "users-info-example,tenant-resolver-example",
-                "--",
-                "--config",
-                "config/e2e-local.yaml",
-            ]
+            server_args = ["--config", "config/e2e-local.yaml"]
+            if getattr(args, "use_prebuilt", False):
+                # Built by cmd_all with E2E_SERVER_FEATURES
+                server_bin = prebuilt_server_path()
+                if not os.path.isfile(server_bin):
+                    print(f"ERROR: Prebuilt server not found: {server_bin}")
+                    sys.exit(1)
+                server_cmd = [server_bin, *server_args]
+            else:
+                server_cmd = [
+                    "cargo",
+                    "run",
+                    "--bin",
+                    "hyperspot-server",
+                    "--features",
+                    ",".join(E2E_SERVER_FEATURES),
+                    "--",
+                    *server_args,
+                ]
 
             # Redirect stdout and stderr to log files
             server_log_file = os.path.join(
@@ -383,13 +702,11 @@ def cmd_e2e(args):
                 server_error_file, "w"
             ) as err_file:
                 # Set RUST_LOG to enable debug logging for types_registry module
-                server_env = os.environ.copy()
-                server_env["RUST_LOG"] = "types_registry=debug,info"
                 server_process = subprocess.Popen(
                     server_cmd,
                     stdout=out_file,
                     stderr=err_file,
-                    env=server_env,
+                    env=make_env(RUST_LOG="types_registry=debug,info"),
                 )
 
             print("Server logs redirected to:")
@@ -402,19 +719,48 @@ def cmd_e2e(args):
             print(f"  - SQL logs: {os.path.join(logs_dir, 'sql.log')}")
             print(f"  - API logs: {os.path.join(logs_dir, 'api.log')}")
 
-            # Wait for server to be ready
-            wait_for_health(base_url, timeout_secs=30)
+            # The server logs SERVER_READY_PATTERN as soon as it has bound
+            # its socket, so there is no point probing /healthz before that.
+            # Console tracing goes to stderr, hence the error log file.
+            wait_for_log_line(
+                server_error_file, SERVER_READY_PATTERN, 30, server_process
+            )
+
+            # Wait for server to be ready, bailing out early if it crashes.
+            # Gets its own full budget: after the bind line it returns almost
+            # at once, and if the line never showed up this is the fallback.
+            wait_for_health(
+                base_url,
+                timeout_secs=30,
+                server_process=server_process,
+                error_log=server_error_file,
+            )
 
     # Run pytest
     step("Running pytest")
-    env = os.environ.copy()
-    env["E2E_BASE_URL"] = base_url
+    env_overrides = {"E2E_BASE_URL": base_url}
 
     # Set E2E_DOCKER_MODE flag for the tests to know which mode they're in
     if args.docker:
-        env["E2E_DOCKER_MODE"] = "1"
+        env_overrides["E2E_DOCKER_MODE"] = "1"
+    env = make_env(**env_overrides)
 
     pytest_cmd = [PYTHON, "-m", "pytest", "testing/e2e", "-vv"]
+    if not os.environ.get("CI"):
+        # Local iteration: rerun last failures first (from .pytest_cache)
+        pytest_cmd.append("--ff")
+    if not args.serial:
+        if importlib.util.find_spec("xdist") is None:
+            print(
+                "pytest-xdist is not installed, running tests serially. "
+                "Install with: pip install -r testing/e2e/requirements.txt"
+            )
+        else:
+            # loadfile keeps tests from one module (and its fixtures) on one worker
+            workers = max(2, (os.cpu_count() or 1) - 2)
+            pytest_cmd.extend(
+                ["-n", "auto", f"--maxprocesses={workers}", "--dist=loadfile"]
+            )
     if args.pytest_args:
         # argparse.REMAINDER includes the '--' separator if used
         # We need to strip it so pytest doesn't treat following flags as files
@@ -458,60 +804,143 @@ def cmd_e2e(args):
     sys.exit(exit_code)
 
 
-def cmd_dylint(_args):
-    step("Building dylint lints")
-    dylint_dir = os.path.join(PROJECT_ROOT, "dylint_lints")
+DYLINT_LIB_EXTS = (".dylib", ".so", ".dll")
+
+
+@lru_cache(maxsize=None)
+def rustc_host():
+    out = subprocess.check_output(["rustc", "--version", "--verbose"], text=True)
+    _, found, rest = out.partition("\nhost: ")
+    return rest.split(maxsplit=1)[0] if found and rest.strip() else ""
+
+
+@lru_cache(maxsize=None)
+def read_toolchain_channel(path, _mtime_ns):
+    if tomllib is not None:
+        with open(path, "rb") as f:
+            return tomllib.load(f).get("toolchain", {}).get("channel", "nightly")
+    toolchain = "nightly"
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if "channel" in line:
+                toolchain = line.split('"')[1]
+                break
+    return toolchain
+
+
+def dylint_toolchain(dylint_dir):
+    """Toolchain channel from rust-toolchain.toml, re-read only when it changes."""
+    path = os.path.join(dylint_dir, "rust-toolchain.toml")
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return "nightly"
+    return read_toolchain_channel(path, mtime_ns)
+
+
+def link_or_copy(src, dst):
+    """Make dst a copy of src, as a hard link when the filesystem allows it.
+
+    The link is created under a temporary name and moved over dst, so a
+    library rebuilt by cargo (new inode) replaces the old one atomically.
+    """
+    try:
+        if os.path.samefile(src, dst):
+            # Already linked to the current build
+            return
+    except FileNotFoundError:
+        pass
+    tmp = f"{dst}.tmp"
+    try:
+        os.unlink(tmp)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, tmp)
+    except OSError:
+        # No hard links (e.g. FAT, some network mounts); copyfile still
+        # copies in-kernel where the platform supports it
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def list_dylint_libs(target_release):
+    """Sorted names of dylint library files in target_release."""
+    with os.scandir(target_release) as it:
+        return sorted(
+            entry.name
+            for entry in it
+            if entry.name.startswith(("libde", "de"))
+            and entry.name.endswith(DYLINT_LIB_EXTS)
+            and entry.is_file(follow_symlinks=False)
+        )
+
+
+def dylint_fingerprint(dylint_dir, toolchain, host):
+    """Digest of everything that feeds the dylint release build.
+
+    Sources are keyed by path, size and mtime rather than content, the same
+    way cargo's own mtime-based fingerprints work.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{toolchain}-{host}".encode())
+    for root, dirs, files in os.walk(dylint_dir):
+        dirs[:] = sorted(
+            d for d in dirs if d != "target" and not d.startswith((".", "__"))
+        )
+        for fname in sorted(files):
+            path = os.path.join(root, fname)
+            st = os.stat(path)
+            rel = os.path.relpath(path, dylint_dir)
+            digest.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def build_dylint_libs(dylint_dir, toolchain, host):
+    """Build the lint libraries and return their toolchain-suffixed paths."""
     run_cmd(["cargo", "build", "--release"], cwd=dylint_dir)
     # Copy toolchain-suffixed names similar to Makefile
-    rustc_host = (
-        subprocess.check_output(["rustc", "--version", "--verbose"])
-        .decode()
-        .splitlines()
-    )
-    host = next((line.split()[-1] for line in rustc_host if line.startswith("host:")), "")
-    toolchain = "nightly"
-    rust_toolchain_path = os.path.join(dylint_dir, "rust-toolchain.toml")
-    if os.path.isfile(rust_toolchain_path):
-        with open(rust_toolchain_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if "channel" in line:
-                    toolchain = line.split('"')[1]
-                    break
     target_release = os.path.join(dylint_dir, "target", "release")
-    for fname in os.listdir(target_release):
-        if not fname.startswith("libde") and not fname.startswith("de"):
-            continue
+    lib_names = list_dylint_libs(target_release)
+    dylint_libs = set(f for f in lib_names if "@" in f)
+    for fname in lib_names:
         if "@" in fname:
             continue
-        if fname.endswith(".dylib"):
-            ext = ".dylib"
-        elif fname.endswith(".so"):
-            ext = ".so"
-        elif fname.endswith(".dll"):
-            ext = ".dll"
-        else:
-            continue
-        base = fname[: -len(ext)]
+        base, ext = os.path.splitext(fname)
         target = f"{base}@{toolchain}-{host}{ext}"
         src = os.path.join(target_release, fname)
         dst = os.path.join(target_release, target)
         try:
-            shutil.copyfile(src, dst)
+            link_or_copy(src, dst)
         except OSError:
             pass
-    dylint_libs = sorted(
-        [
-            os.path.join(target_release, f)
-            for f in os.listdir(target_release)
-            if (f.startswith("libde") or f.startswith("de"))
-            and ("@" in f)
-            and (
-                f.endswith(".dylib")
-                or f.endswith(".so")
-                or f.endswith(".dll")
-            )
-        ]
-    )
+        if os.path.exists(dst):
+            dylint_libs.add(target)
+    return [os.path.join(target_release, f) for f in sorted(dylint_libs)]
+
+
+def cmd_dylint(_args):
+    step("Building dylint lints")
+    dylint_dir = os.path.join(PROJECT_ROOT, "dylint_lints")
+    host = rustc_host()
+    toolchain = dylint_toolchain(dylint_dir)
+    fingerprint = dylint_fingerprint(dylint_dir, toolchain, host)
+    stamp_path = os.path.join(dylint_dir, "target", ".dylint_fingerprint")
+    try:
+        with open(stamp_path, "r", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        stamp = {}
+    dylint_libs = stamp.get("libs") or []
+    if stamp.get("fingerprint") == fingerprint and all(
+        os.path.isfile(lib) for lib in dylint_libs
+    ):
+        print("Dylint lints are up to date, skipping build")
+    else:
+        dylint_libs = build_dylint_libs(dylint_dir, toolchain, host)
+        if dylint_libs:
+            with open(stamp_path, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": fingerprint, "libs": dylint_libs}, f)
     if not dylint_libs:
         print("ERROR: No dylint libraries found after build.")
         sys.exit(1)
@@ -536,18 +965,9 @@ def cmd_dylint_list(_args):
     step("Listing dylint lints")
     dylint_dir = os.path.join(PROJECT_ROOT, "dylint_lints")
     target_release = os.path.join(dylint_dir, "target", "release")
-    dylint_libs = sorted(
-        [
-            os.path.join(target_release, f)
-            for f in os.listdir(target_release)
-            if (f.startswith("libde") or f.startswith("de"))
-            and (
-                f.endswith(".dylib")
-                or f.endswith(".so")
-                or f.endswith(".dll")
-            )
-        ]
-    )
+    dylint_libs = [
+        os.path.join(target_release, f) for f in list_dylint_libs(target_release)
+    ]
     if not dylint_libs:
         print("ERROR: No dylint libraries found. Run 'python scripts/ci.py dylint' first.")
         sys.exit(1)
@@ -705,25 +1125,64 @@ def cmd_all(args):
     step("Running full build and testing pipeline")
     cmd_check(args)
     step("Running SQLite integration tests")
+    if getattr(args, "legacy", False):
+        test_args = ["--nocapture"]
+    else:
+        test_args = ["--no-capture"]
+    run_cmd(
+        test_cmd(
+            args,
+            ["-p", "cf-modkit-db", "--features", "sqlite,integration"],
+            test_args,
+        )
+    )
+    step("Building e2e server (stable, release)")
+    # Reuses the release dependency artifacts of the plain build below, instead
+    # of e2e-local building a separate debug server with 'cargo run'
     run_cmd(
         [
             "cargo",
-            "test",
-            "-p",
-            "modkit-db",
+            "+stable",
+            "build",
+            "--release",
+            "--bin",
+            "hyperspot-server",
             "--features",
-            "sqlite,integration",
-            "--",
-            "--nocapture",
+            ",".join(E2E_SERVER_FEATURES),
         ]
     )
+    # The plain build below replaces target/release/hyperspot-server; a real
+    # copy (not a hard link) can't be touched by cargo rewriting that file
+    shutil.copy2(release_server_path(), prebuilt_server_path())
     step("Building release (stable)")
     run_cmd(["cargo", "+stable", "build", "--release"])
     step("Running e2e-local")
-    cmd_e2e(argparse.Namespace(docker=False, pytest_args=[]))
+    cmd_e2e(
+        argparse.Namespace(
+            docker=False,
+            features=None,
+            serial=False,
+            use_prebuilt=True,
+            pytest_args=[],
+        )
+    )
     print("All (full pipeline) completed")
 
 
+def add_test_args(parser):
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=default_test_jobs(),
+        help="Number of tests to run in parallel (nextest only)",
+    )
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Run tests with plain cargo test instead of cargo-nextest",
+    )
+
+
 def build_parser():
     parser = argparse.ArgumentParser(
         description="HyperSpot CI utility (Python, cross-platform)",
@@ -743,6 +1202,7 @@ def build_parser():
 
     # test
     p_test = subparsers.add_parser("test", help="Run unit tests")
+    add_test_args(p_test)
     p_test.set_defaults(func=cmd_test)
 
     # audit
@@ -760,6 +1220,7 @@ def build_parser():
     # check
     p_check = subparsers.add_parser("check", help="Run full check suite (fmt + clippy + test + security)")
     p_check.add_argument("--fix", action="store_true", help="Auto-fix formatting and clippy issues")
+    add_test_args(p_check)
     p_check.set_defaults(func=cmd_check)
 
     # quickstart
@@ -778,6 +1239,11 @@ def build_parser():
         default="users-info-example",
         help="Cargo features to enable for Docker build (default: users-info-example)",
     )
+    p_e2e.add_argument(
+        "--serial",
+        action="store_true",
+        help="Run pytest in a single process instead of with pytest-xdist",
+    )
     p_e2e.add_argument(
         "pytest_args",
         nargs=argparse.REMAINDER,
@@ -832,12 +1298,15 @@ def build_parser():
     # all
     p_all = subparsers.add_parser("all", help="Run full pipeline (Makefile all equivalent)")
     p_all.add_argument("--fix", action="store_true", help="Auto-fix formatting/clippy")
+    add_test_args(p_all)
     p_all.set_defaults(func=cmd_all)
 
     return parser
 
 
 def main():
+    # Flush every print line so it lands before output of the next child
+    sys.stdout.reconfigure(line_buffering=True)
     os.chdir(PROJECT_ROOT)
     parser = build_parser()
     args = parser.parse_args()